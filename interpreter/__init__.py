@@ -0,0 +1,53 @@
+# A toy expression language: lexer -> parser -> AST -> typechecker ->
+# evaluator. The submodules are imported on first use of a name, so
+# importing the package itself costs next to nothing:
+#
+#   from interpreter import parse, eval
+#   eval(parse("1 + 2"))
+
+import importlib
+
+# module -> the names it provides at package level
+_exports = {
+    "nodes": """NumType FloatType BoolType StringType ListType DictType SetType FnType
+        SimType NumLiteral FloatLiteral StringLiteral Integer BinOp Variable Let
+        BoolLiteral if_else while_loop for_loop foreach_loop Two_Str_concatenation
+        Str_slicing LetMut Seq Put Assign Get Print LetFun FunCall FnObject Yield
+        LetAnd UBoolOp UnOp ListLiteral Cons Index BuiltinCall PVecLiteral
+        DictLiteral SetLiteral Use AST InvalidProgram TypeError join_type list_of
+        elem_type children""",
+    "values": "PVector Rope StrView ListView VIEW_MIN make_view as_str Value",
+    "lexer": """EndOfStream Stream Num Float Bool Keyword Identifier Operator String
+        EndOfTokens Token keywords symbolic_operators word_operators whitespace
+        word_to_token TokenError Lexer lex_tokens""",
+    "parser": "Parser keyword_parsers parse SourceTree",
+    "natives": "Builtin BUILTINS builtin fixed sized is_lazy mutable_list",
+    "evaluator": """Environment Thunk strict_in is_strict delay contains_yield apply_fn
+        eval gen_eval typed_eval""",
+    "typechecker": "typecheck retype clear_types typecheck_report check_call",
+    "driver": """split_fragments FragmentResult fragment_key run_fragment refresh
+        watch fragment_output limits_from_argv run_jobs init_server_worker compiled_fragment
+        run_batch start_server serve request client
+        startup_report main""",
+    "program": "Interpreter CompiledProgram compile",
+    "batch": "read_rows columnwise eval_rows run_rows run_dataset",
+    "modules": "ModuleCache MODULES parse_module",
+    "snapshot": "snapshot restore SnapshotError",
+    "limits": "Limits Budget LimitExceeded",
+    "sandbox": "SandboxPool",
+    "trace": "Tracer LEVELS CATEGORIES trace_from_argv",
+}
+_where = {name: module for module, names in _exports.items() for name in names.split()}
+
+__all__ = list(_where)
+
+def __getattr__(name):
+    if name not in _where:
+        raise AttributeError("module 'interpreter' has no attribute %r" % name)
+    value = getattr(importlib.import_module("." + _where[name], __name__), name)
+    # later lookups don't come through here
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(_where))
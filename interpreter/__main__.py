@@ -0,0 +1,5 @@
+# python -m interpreter prog.toy
+
+from .driver import main
+
+main()
@@ -0,0 +1,140 @@
+# Batch evaluation: one compiled program over every row of a dataset.
+# Each row's fields are bound as variables. Rows are read, evaluated and
+# written in chunks, so memory stays bounded however large the input.
+#
+#   rule = compile("amount * rate")
+#   run_dataset(rule, "rows.csv", "results.jsonl", jobs=4)
+
+from itertools import islice, repeat
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import csv
+import json
+import operator
+
+from .nodes import *
+from .program import CompiledProgram
+from .evaluator import walk
+
+# rows per chunk
+CHUNK = 1000
+
+def number(text: str):
+    # a CSV field as an int or float when it reads as one
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+def read_rows(path: str) -> Iterator[Dict]:
+    # the rows of a .csv (header line first) or .jsonl file, one at a time
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            for row in csv.DictReader(f):
+                yield {k: number(v) for k,v in row.items()}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+def to_json(v):
+    # Fractions, ropes, lists and the like are written as their str()
+    if v is None or isinstance(v, (bool, int, float, str)):
+        return v
+    return str(v)
+
+# operators columnwise programs are made of
+COLUMN_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,
+    "%": operator.mod,
+}
+
+def columnwise(program: AST) -> Optional[Callable]:
+    # for a program that is only arithmetic on variables and numbers, a
+    # function from columns (name -> list of values) and a row count to
+    # the results, computed a whole column at a time; None otherwise
+    match program:
+        case NumLiteral(value):
+            return lambda columns, n: repeat(value, n)
+        case Variable(name):
+            return lambda columns, n: columns[name]
+        case BinOp(op, left, right) if op in COLUMN_OPS:
+            f=columnwise(left)
+            g=columnwise(right)
+            if f is None or g is None:
+                return None
+            fn=COLUMN_OPS[op]
+            return lambda columns, n: map(fn, f(columns, n), g(columns, n))
+    return None
+
+def eval_rows(program: CompiledProgram, rows: List[Dict]) -> List[Dict]:
+    # {"value": ..., "error": ...} for each row
+    f=columnwise(program.program)
+    if f is not None:
+        try:
+            names={v.name for v in walk(program.program) if isinstance(v, Variable)}
+            columns={name: [row[name] for row in rows] for name in names}
+            return [{"value": to_json(v), "error": None} for v in f(columns, len(rows))]
+        except Exception:
+            # a missing field or a division by zero somewhere in the
+            # chunk: run it row by row to find which rows fail
+            pass
+    results=[]
+    for row in rows:
+        try:
+            results.append({"value": to_json(program.run(row)), "error": None})
+        except Exception as e:
+            results.append({"value": None, "error": repr(e)})
+    return results
+
+def chunks(rows: Iterable[Dict], size: int) -> Iterator[List[Dict]]:
+    rows=iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+# the program a worker process evaluates, set once when it starts
+worker_program: Optional[CompiledProgram] = None
+
+def init_worker(program: CompiledProgram):
+    global worker_program
+    worker_program=program
+
+def eval_worker_rows(rows: List[Dict]) -> List[Dict]:
+    return eval_rows(worker_program, rows)
+
+def run_rows(program: CompiledProgram, rows: Iterable[Dict], chunk: int = CHUNK,
+             jobs: Optional[int] = None) -> Iterator[Dict]:
+    # the result of each row, in order. With jobs, chunks are evaluated
+    # across that many worker processes, with at most two chunks per
+    # worker read ahead of the results.
+    if not jobs:
+        for rows_ in chunks(rows, chunk):
+            yield from eval_rows(program, rows_)
+        return
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(jobs, initializer=init_worker, initargs=(program,)) as pool:
+        pending=deque()
+        for rows_ in chunks(rows, chunk):
+            pending.append(pool.submit(eval_worker_rows, rows_))
+            if len(pending)>=2*jobs:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def run_dataset(program: CompiledProgram, source: str, destination: str, chunk: int = CHUNK,
+                jobs: Optional[int] = None) -> int:
+    # evaluates program over the rows of source, writing one JSON line
+    # per row to destination; returns the number of rows
+    n=0
+    with open(destination, "w") as out:
+        for r in run_rows(program, read_rows(source), chunk, jobs):
+            out.write(json.dumps(r)+"\n")
+            n+=1
+    return n
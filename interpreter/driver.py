@@ -0,0 +1,493 @@
+# Driver: splits a source file into fragments and runs them, once, in
+# watch mode, across processes or as a server. The interpreter itself is
+# only imported when a fragment has to run, so the client starts fast.
+
+from dataclasses import dataclass
+from typing import Optional, Dict, List
+import hashlib
+import io
+import os
+import re
+import sys
+import time
+
+def split_fragments(text: str) -> List[str]:
+    # the { ... } fragments of a source file, without the braces. Only
+    # the brace positions are visited, the text between them is sliced.
+    fragments=[]
+    parts=[]
+    parens=0
+    last=0
+    for m in re.finditer("[{}]", text):
+        i=m.start()
+        if parens>0:
+            parts.append(text[last:i])
+        last=i+1
+        if text[i]=="{":
+            parens+=1
+            continue
+        parens-=1
+        if not parens:
+            buff="".join(parts)
+            parts=[]
+            if buff:
+                fragments.append(buff)
+    return fragments
+
+@dataclass
+class FragmentResult:
+    # everything watch mode remembers about one fragment
+    program: 'AST'
+    type: Optional['SimType']
+    value: 'Value'
+    output: str
+    error: Optional[str] = None
+
+# the modules a fragment or a module uses
+USES = re.compile(r'\buse\s+"([^"]*)"')
+
+def module_stamps(source: str, seen: Optional[set] = None, base: Optional[str] = None) -> List:
+    # (path, mtime, size) of every module source uses, directly or
+    # through the modules it uses; None for a file that can't be read.
+    # Relative paths are taken from base, by default the current directory.
+    seen=set() if seen is None else seen
+    stamps=[]
+    for path in USES.findall(source):
+        path=os.path.abspath(os.path.join(base or "", path))
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            st=os.stat(path)
+            with open(path) as f:
+                text=f.read()
+        except OSError:
+            stamps.append((path,None))
+            continue
+        stamps.append((path,st.st_mtime_ns,st.st_size))
+        stamps.extend(module_stamps(text, seen, base))
+    return stamps
+
+def fragment_key(source: str, base: Optional[str] = None) -> bytes:
+    # the fragment's text, and the modules it uses as they are now, so
+    # that editing a module reruns the fragments that use it
+    h=hashlib.blake2b(source.encode(), digest_size=16)
+    if "use" in source:
+        h.update(repr(module_stamps(source, None, base)).encode())
+    return h.digest()
+
+def run_fragment(source: str, lazy: bool = False) -> FragmentResult:
+    # lex, parse, typecheck and evaluate one fragment, capturing what it
+    # prints. A fragment the typechecker rejects is still evaluated
+    # untyped, the way the plain driver runs it.
+    from .parser import parse
+    from .nodes import TypeError
+    from .typechecker import typecheck
+    from .evaluator import eval, Environment
+    # output goes to the environment rather than a redirected stdout, so
+    # fragments can run in several threads at once
+    out=io.StringIO()
+    program=None
+    t=None
+    try:
+        program=parse(source)
+        try:
+            program=typecheck(program, Environment(out=out), in_place=True)
+            t=program.type
+        except (TypeError, KeyError):
+            program=parse(source)
+        out=io.StringIO()
+        v=eval(program, Environment(lazy, out))
+        return FragmentResult(program, t, v, out.getvalue())
+    except Exception as e:
+        return FragmentResult(program, t, None, out.getvalue(), repr(e))
+
+def refresh(cache: Dict, text: str, lazy: bool = False):
+    # brings cache (fragment_key -> FragmentResult) up to date with text.
+    # Every fragment runs in its own environment, so a fragment depends
+    # on nothing but its own text and the modules it uses, and unchanged
+    # ones are reused as they are. Returns the results in file order and the indices that ran.
+    results=[]
+    ran=[]
+    seen={}
+    for i,source in enumerate(split_fragments(text)):
+        key=fragment_key(source)
+        r=cache.get(key)
+        if r is None:
+            r=run_fragment(source, lazy)
+            ran.append(i)
+        seen[key]=r
+        results.append(r)
+    cache.clear()
+    cache.update(seen)
+    return results, ran
+
+def watch(path: str, lazy: bool = False, interval: float = 0.2):
+    # reruns the changed fragments of path whenever the file changes
+    cache={}
+    mtime=None
+    while True:
+        m=os.stat(path).st_mtime_ns
+        if m!=mtime:
+            mtime=m
+            with open(path) as f:
+                text=f.read()
+            start=time.perf_counter()
+            results,ran=refresh(cache, text, lazy)
+            took=(time.perf_counter()-start)*1000
+            for i in ran:
+                r=results[i]
+                sys.stdout.write(r.output)
+                print(i, "error-> " if r.error else "ans-> ", r.error or r.value)
+            print("%d of %d fragments ran in %.1f ms" % (len(ran), len(results), took))
+        time.sleep(interval)
+
+def fragment_output(i: int, source: str, lazy: bool = False, limits: Optional['Limits'] = None,
+                    trace: Optional['Tracer'] = None) -> str:
+    # everything the driver prints for fragment i, captured so that
+    # fragments run in worker processes or threads can be printed in
+    # file order. With limits, the run gets a Budget and a used-> line
+    # reports what it took. trace gets the debug records of the run.
+    from .parser import parse
+    from .evaluator import eval, Environment
+    from .limits import Budget
+    out=io.StringIO()
+    budget=Budget(limits) if limits is not None else None
+    try:
+        print(i,source, file=out)
+        y=parse(source, trace)
+        print("y-> ",y, file=out)
+        v=eval(y, Environment(lazy, out, budget=budget, trace=trace))
+        print("ans-> ",v, file=out)
+    except Exception as e:
+        print(i, "error-> ", repr(e), file=out)
+    if budget is not None:
+        print("used-> ", budget.usage(), file=out)
+    return out.getvalue()
+
+def limits_from_argv(argv: List[str]) -> Optional['Limits']:
+    # --max-steps N --timeout SECONDS --max-size N --max-depth N
+    from .limits import Limits
+    flags={"--max-steps": ("steps", int), "--timeout": ("seconds", float),
+           "--max-size": ("size", int), "--max-depth": ("depth", int)}
+    given={name: conv(argv[argv.index(flag)+1]) for flag,(name,conv) in flags.items() if flag in argv}
+    return Limits(**given) if given else None
+
+def run_jobs(fragments: List[str], jobs: int, lazy: bool = False, limits: Optional['Limits'] = None):
+    # the output of each fragment, in order, with the fragments parsed
+    # and evaluated across a pool of jobs processes. Fragments are handed
+    # out in chunks so that small ones don't cost a round trip each.
+    from concurrent.futures import ProcessPoolExecutor
+    chunksize=max(1, len(fragments)//(jobs*4))
+    with ProcessPoolExecutor(jobs) as pool:
+        yield from pool.map(fragment_output, range(len(fragments)), fragments,
+                            [lazy]*len(fragments), [limits]*len(fragments), chunksize=chunksize)
+
+def run_threads(fragments: List[str], threads: int, lazy: bool = False, limits: Optional['Limits'] = None,
+                trace: Optional['Tracer'] = None):
+    # run_jobs with a pool of threads in this process. Every fragment has
+    # its own Environment, which holds all the state a run changes, so
+    # on a free-threaded Python (3.13t and later) they run in parallel.
+    # They share trace, whose records interleave in the order written.
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(threads) as pool:
+        yield from pool.map(fragment_output, range(len(fragments)), fragments, [lazy]*len(fragments),
+                            [limits]*len(fragments), [trace]*len(fragments))
+
+# Server mode. A long-running process keeps its worker processes, with
+# the interpreter already imported, the prelude already evaluated and the
+# fragments they have compiled, and the results of the fragments it has
+# run, so a job costs a socket round trip instead of a Python start.
+# Requests and responses are one JSON object per line:
+#   {"source": text} or {"fragments": [...]}, optionally "lazy": true and
+#   "cwd": the directory relative module paths are taken from
+#   -> {"results": [{"value": ..., "output": ..., "error": ...}, ...]}
+
+# results kept by the server, and programs kept by each worker, oldest
+# dropped first
+SERVER_CACHE = 10000
+
+def parse_address(address: str):
+    # host:port is localhost TCP, anything else a Unix socket path
+    host,_,port=address.rpartition(":")
+    if host and port.isdigit():
+        return host,int(port)
+    return address
+
+# the state of a server worker process: the prelude given to serve, an
+# Interpreter over it for each (lazy, cwd), and the programs compiled so
+# far by (fragment_key, lazy, cwd)
+server_prelude: Optional[str] = None
+server_interpreters: Dict = {}
+server_programs: Dict = {}
+
+def init_server_worker(prelude: Optional[str] = None):
+    global server_prelude
+    server_prelude=prelude
+
+def compiled_fragment(key: bytes, source: str, lazy: bool, cwd: Optional[str]) -> 'CompiledProgram':
+    # the fragment compiled, typed if it typechecks, the way run_fragment
+    # runs it
+    program=server_programs.get((key,lazy,cwd))
+    if program is not None:
+        return program
+    from .nodes import TypeError
+    interpreter=server_interpreters.get((lazy,cwd))
+    if interpreter is None:
+        from .program import Interpreter
+        from .modules import ModuleCache
+        interpreter=server_interpreters[lazy,cwd]=Interpreter(server_prelude, lazy, ModuleCache(base=cwd))
+    try:
+        program=interpreter.compile(source, {})
+    except (TypeError, KeyError):
+        program=interpreter.compile(source)
+    server_programs[key,lazy,cwd]=program
+    while len(server_programs)>SERVER_CACHE:
+        del server_programs[next(iter(server_programs))]
+    return program
+
+def run_batch(fragments: List, lazy: bool = False, cwd: Optional[str] = None) -> List[Dict]:
+    # runs (fragment_key, source) pairs in a worker, returning what can
+    # be sent back as JSON
+    results=[]
+    for key,source in fragments:
+        out=io.StringIO()
+        try:
+            v=compiled_fragment(key, source, lazy, cwd).run(out=out)
+            results.append({"value": str(v), "output": out.getvalue(), "error": None})
+        except Exception as e:
+            results.append({"value": None, "output": out.getvalue(), "error": repr(e)})
+    return results
+
+async def serve_request(request: Dict, pool, cache: Dict, jobs: int) -> Dict:
+    import asyncio
+    fragments=request.get("fragments")
+    if fragments is None:
+        fragments=split_fragments(request.get("source",""))
+    lazy=bool(request.get("lazy"))
+    cwd=request.get("cwd")
+    loop=asyncio.get_running_loop()
+    # fragment_key reads the module files, so not in the event loop
+    keys=await loop.run_in_executor(None, lambda: [fragment_key(f, cwd) for f in fragments])
+    missing={}
+    for key,f in zip(keys,fragments):
+        if (key,lazy,cwd) not in cache:
+            missing[key]=f
+    if missing:
+        # one batch per worker
+        todo=list(missing.items())
+        size=-(-len(todo)//jobs)
+        chunks=[todo[j:j+size] for j in range(0,len(todo),size)]
+        done=await asyncio.gather(*[loop.run_in_executor(pool, run_batch, chunk, lazy, cwd) for chunk in chunks])
+        for chunk,results in zip(chunks,done):
+            for (key,_),r in zip(chunk,results):
+                cache[key,lazy,cwd]=r
+        while len(cache)>SERVER_CACHE:
+            del cache[next(iter(cache))]
+    return {"results": [cache[key,lazy,cwd] for key in keys]}
+
+async def start_server(address: str, pool, jobs: int = 1):
+    # starts listening on address; fragments run in pool
+    import asyncio
+    import json
+    cache={}
+    async def handle(reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    response=await serve_request(json.loads(line), pool, cache, jobs)
+                except Exception as e:
+                    response={"error": repr(e)}
+                writer.write(json.dumps(response).encode()+b"\n")
+                await writer.drain()
+        finally:
+            writer.close()
+    where=parse_address(address)
+    if isinstance(where,tuple):
+        return await asyncio.start_server(handle, *where, limit=2**26)
+    if os.path.exists(where):
+        os.unlink(where)
+    return await asyncio.start_unix_server(handle, where, limit=2**26)
+
+def serve(address: str, jobs: int = None, prelude: Optional[str] = None):
+    # runs the server until interrupted; prelude is a fragment whose
+    # assignments every fragment sees, evaluated once per worker
+    import asyncio
+    from concurrent.futures import ProcessPoolExecutor
+    jobs=jobs or os.cpu_count() or 1
+    async def main():
+        with ProcessPoolExecutor(jobs, initializer=init_server_worker, initargs=(prelude,)) as pool:
+            # start the workers now rather than on the first request
+            await asyncio.gather(*[asyncio.get_running_loop().run_in_executor(pool, run_batch, []) for _ in range(jobs)])
+            server=await start_server(address, pool, jobs)
+            print("serving on", address)
+            async with server:
+                await server.serve_forever()
+    asyncio.run(main())
+
+def request(address: str, message: Dict) -> Dict:
+    # sends one request to a server and waits for the response
+    import json
+    import socket
+    where=parse_address(address)
+    if isinstance(where,tuple):
+        sock=socket.create_connection(where)
+    else:
+        sock=socket.socket(socket.AF_UNIX)
+        sock.connect(where)
+    with sock, sock.makefile("rwb") as f:
+        f.write(json.dumps(message).encode()+b"\n")
+        f.flush()
+        return json.loads(f.readline())
+
+def client(address: str, path: str, lazy: bool = False):
+    # runs the fragments of path on a server, printing like watch mode
+    with open(path) as f:
+        response=request(address, {"source": f.read(), "lazy": lazy, "cwd": os.getcwd()})
+    if "error" in response:
+        print("error-> ", response["error"])
+        return
+    for i,r in enumerate(response["results"]):
+        sys.stdout.write(r["output"])
+        print(i, "error-> " if r["error"] else "ans-> ", r["error"] or r["value"])
+
+def startup_report(runs: int = 5) -> Dict:
+    # seconds until the package is imported and until a first result,
+    # each the best of runs fresh interpreters, next to a bare python
+    # start; plus the import time of every package module, in
+    # microseconds, from python -X importtime
+    import subprocess
+    root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def best(code):
+        times=[]
+        for _ in range(runs):
+            start=time.perf_counter()
+            subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+            times.append(time.perf_counter()-start)
+        return min(times)
+    report={
+        "python": best("pass"),
+        "import": best("import interpreter"),
+        "first_result": best("from interpreter import parse, eval; eval(parse('1 + 2'))"),
+    }
+    err=subprocess.run([sys.executable, "-X", "importtime", "-c", "from interpreter import parse, eval"],
+                       cwd=root, check=True, capture_output=True, text=True).stderr
+    for line in err.splitlines():
+        self_us,cumulative,name=line.split("|")
+        if name.strip().startswith("interpreter") and cumulative.strip().isdigit():
+            report[name.strip()]=int(cumulative)
+    return report
+
+def main():
+    # python -m interpreter prog.toy, see the README for the options
+    #10
+    # x=input()
+    # print(x)
+    # y=parse(x)
+    # print("y-> ",y)
+    # print("ans-> ", eval(y))
+
+    # start = time.time()
+
+    if sys.argv[1]=="--startup":
+        # python -m interpreter --startup
+        for name,v in startup_report().items():
+            print(name, "%.1f ms" % (v*1000) if isinstance(v,float) else "%d us" % v)
+        return
+    if sys.argv[1]=="--batch":
+        # python -m interpreter --batch rule.toy rows.csv out.jsonl [--jobs 8]
+        from .program import compile
+        from .batch import run_dataset
+        with open(sys.argv[2]) as f:
+            rule=compile(split_fragments(f.read())[0])
+        jobs=int(sys.argv[sys.argv.index("--jobs")+1]) if "--jobs" in sys.argv else None
+        print(run_dataset(rule, sys.argv[3], sys.argv[4], jobs=jobs), "rows")
+        return
+    if sys.argv[1]=="--serve":
+        # python -m interpreter --serve /tmp/toy.sock [--jobs 8] [--prelude prelude.toy]
+        jobs=int(sys.argv[sys.argv.index("--jobs")+1]) if "--jobs" in sys.argv else None
+        prelude=None
+        if "--prelude" in sys.argv:
+            with open(sys.argv[sys.argv.index("--prelude")+1]) as f:
+                prelude=split_fragments(f.read())[0]
+        serve(sys.argv[2], jobs, prelude)
+        return
+    if sys.argv[1]=="--client":
+        # python -m interpreter --client /tmp/toy.sock prog.toy
+        client(sys.argv[2], sys.argv[3], "--lazy" in sys.argv)
+        return
+    file=open(sys.argv[1],'r')
+    #11
+    # x=input()
+    # x=file.read()
+    # print(x)
+    # y=parse(x)
+    # print("y-> ",y)
+    # z=typecheck(y)
+    # print("z-> ",z)
+    # print("ans-> ", eval(z))
+    # print(z.type)
+
+    #12
+    # for line in file.readlines():
+    #     x=line
+    #     print(x)
+    #     y=parse(x)
+    #     print("y-> ",y)
+    #     print("ans-> ",eval(y))
+    # 13
+    if "--watch" in sys.argv:
+        # python -m interpreter prog.toy --watch
+        file.close()
+        watch(sys.argv[1], "--lazy" in sys.argv)
+    from .parser import parse
+    from .evaluator import eval, Environment
+    from .trace import trace_from_argv
+    x=file.read()
+    result = split_fragments(x)
+    limits=limits_from_argv(sys.argv)
+    # python -m interpreter prog.toy --trace eval,env --trace-level debug --trace-file trace.log
+    trace=trace_from_argv(sys.argv)
+    if "--jobs" in sys.argv:
+        # python -m interpreter prog.toy --jobs 8
+        if trace is not None:
+            # the workers can't write to this process's trace file
+            sys.exit("--trace can't be used with --jobs, use --threads")
+        jobs=int(sys.argv[sys.argv.index("--jobs")+1])
+        for out in run_jobs(result, jobs, "--lazy" in sys.argv, limits):
+            sys.stdout.write(out)
+        result=[]
+    if "--threads" in sys.argv:
+        # python -m interpreter prog.toy --threads 8
+        threads=int(sys.argv[sys.argv.index("--threads")+1])
+        for out in run_threads(result, threads, "--lazy" in sys.argv, limits, trace):
+            sys.stdout.write(out)
+        result=[]
+    if limits is not None:
+        # python -m interpreter prog.toy --max-steps 100000 --timeout 2
+        for i, r in enumerate(result):
+            sys.stdout.write(fragment_output(i, r, "--lazy" in sys.argv, limits, trace))
+        result=[]
+    for i, r in enumerate(result):
+        print(i,r)
+        y=parse(r, trace)
+        print("y-> ",y)
+        # python -m interpreter prog.toy --lazy evaluates call-by-need
+        print("ans-> ",eval(y, Environment(lazy="--lazy" in sys.argv, trace=trace)))
+
+    # end = time.time()
+    # print(end - start)
+
+    # You should parse, evaluate and see whether the expression produces the expected value in your tests.
+    # print(parse("if a+b > 2*d then a*b - c + d else e*f/g end"))
+    # print(parse("if 10*5 > 6*6 then 10*5 else 6*6 end"))
+    # print(" eval ")
+    # b=parse("if 10*5 > 6*6 then 10*5 else 6*6 end")
+    # print("b ",b)
+    # print(eval(b))
+    # c=parse("let a is 5 in let b is 7 in a+b end end ")
+    # print("c ",c)
+    # print(eval(c))
+    # code1.eval(parse("if a+b > 2*d then a*b - c + d else e*f/g end"))
+
+# main() runs from __main__.py: python -m interpreter prog.toy
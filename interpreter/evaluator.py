@@ -0,0 +1,690 @@
+# Evaluator: runs an AST in an Environment.
+
+from fractions import Fraction
+from typing import Dict, List, Optional, TextIO
+import operator
+import weakref
+
+from .nodes import *
+from .values import *
+from .limits import LimitExceeded
+from . import natives, typechecker
+
+class Environment:
+    # Everything a run of eval or typecheck changes is held here, so runs
+    # in different environments can go on in different threads at once.
+    env: List
+    # call-by-need: let bindings and function arguments are bound to
+    # thunks that are only evaluated when first read
+    lazy: bool
+    # typecheck writes types onto the nodes instead of copying the tree
+    in_place: bool
+    # where the program prints; None is sys.stdout at the time of printing
+    out: Optional[TextIO]
+    # is_strict results, (id(node), name) -> (node, result); it can be
+    # shared by environments that run the same trees
+    strict: Dict
+    # where use finds modules, by default the process-wide cache
+    modules: 'modules.ModuleCache'
+    # the limits of the run and what it has used, None for no limits
+    budget: Optional['limits.Budget']
+    # where debug records go, None for no tracing
+    trace: Optional['trace.Tracer']
+    # the thunks of this run that read variables and haven't been forced
+    # yet; shared by forks
+    pending: weakref.WeakSet
+    # the ids of the lists, dicts and sets this run shares with other
+    # runs, which are copied before they are changed in place; see
+    # program.Interpreter
+    shared: frozenset
+
+    def __init__(self, lazy=False, out=None, strict=None, modules=None, budget=None, trace=None):
+        self.env=[{}]
+        self.lazy=lazy
+        self.in_place=False
+        self.out=out
+        self.strict={} if strict is None else strict
+        self.modules=modules
+        self.budget=budget
+        self.trace=trace
+        self.pending=weakref.WeakSet()
+        self.shared=frozenset()
+
+    def enter_scope(self):
+        self.env.append({})
+
+    def exit_scope(self):
+        assert self.env
+        self.env.pop()
+
+    def add(self,name,value):
+        assert name not in self.env[-1]
+        self.env[-1][name]=value
+
+    def check(self,name):
+        for dict in reversed(self.env):
+            if name in dict:
+                return True
+            else:
+                return False
+            
+    def get(self,name):
+        for dict in reversed(self.env):
+            if name in dict:
+                v=dict[name]
+                if isinstance(v,Thunk):
+                    # forced once, then the frame holds the plain value
+                    v=v.force()
+                    dict[name]=v
+                return v
+        raise KeyError()
+    
+    def update(self,name,value):
+
+        for dict in reversed(self.env):
+            if name in dict:
+                dict[name]=value
+                return
+
+        raise KeyError()
+
+    def settle(self):
+        # called before anything a thunk could read is changed: the
+        # pending thunks are forced first, so lazy mode reads the same
+        # values as eager mode would have
+        while self.pending:
+            self.pending.pop().settle()
+
+    def __getstate__(self):
+        # for snapshots, which keep the scopes; the output, the memo of
+        # node ids, the module cache, the budget and the tracer belong to
+        # this process
+        return {"env": self.env, "lazy": self.lazy, "in_place": self.in_place}
+
+    def __setstate__(self, state):
+        self.__init__(state["lazy"])
+        self.env=state["env"]
+        self.in_place=state["in_place"]
+
+    def use(self, path: str):
+        # enters the module's frame, shared and read-only, and a scope
+        # above it for the bindings made while it is in use
+        from .modules import MODULES
+        self.env.append((self.modules or MODULES).load(path))
+        self.env.append({})
+
+    def fork(self):
+        # a new environment over the same scopes; entering and leaving
+        # scopes in the fork doesn't affect this one, but bindings in
+        # the shared scopes are still seen by both
+        e=Environment(self.lazy, self.out, self.strict, self.modules, self.budget, self.trace)
+        e.in_place=self.in_place
+        e.pending=self.pending
+        e.shared=self.shared
+        e.env=list(self.env)
+        return e
+
+class Thunk:
+    # a delayed expression together with the scopes it was bound in
+    __slots__ = ("expr", "environment", "value", "error", "__weakref__")
+
+    def __init__(self, expr, environment):
+        self.expr=expr
+        self.environment=environment
+        self.value=None
+        self.error=None
+
+    def force(self):
+        if self.environment is not None:
+            self.value=eval(self.expr, self.environment)
+            # drop the scopes so they can be collected
+            self.expr=None
+            self.environment=None
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+    def settle(self):
+        # forces it now, keeping an error to be raised when it is read;
+        # a limit exceeded stops the run whether or not it is read
+        try:
+            self.force()
+        except LimitExceeded:
+            raise
+        except Exception as e:
+            self.error=e
+            self.expr=None
+            self.environment=None
+
+def strict_in(name: str, program: 'AST') -> bool:
+    # whether evaluating program always reads the variable name. Bindings
+    # that are certainly used get evaluated right away in lazy mode,
+    # since a thunk for them would only add overhead.
+    match program:
+        case Variable(n) | Get(Variable(n)):
+            return n==name
+        case BinOp("and" | "or", left, _):
+            return strict_in(name, left)
+        case BinOp(_, left, right):
+            return strict_in(name, left) or strict_in(name, right)
+        case if_else(expr,et,ef):
+            return strict_in(name, expr) or (strict_in(name, et) and strict_in(name, ef))
+        case Let(Variable(n),e1,e2) | LetMut(Variable(n),e1,e2):
+            return strict_in(name, e1) or (n!=name and strict_in(name, e2))
+        case LetAnd(Variable(n1),e1,Variable(n2),e2,e3):
+            return (strict_in(name, e1) or strict_in(name, e2)
+                    or (name not in (n1,n2) and strict_in(name, e3)))
+        case LetFun(Variable(n),_,_,expr):
+            return n!=name and strict_in(name, expr)
+        case Seq(body):
+            return any(strict_in(name, item) for item in body)
+        case while_loop(condition,_):
+            return strict_in(name, condition)
+        case for_loop(Variable(n),e1,condition,_,_):
+            return strict_in(name, e1) or (n!=name and strict_in(name, condition))
+        case foreach_loop(_,e1,_):
+            return strict_in(name, e1)
+        case Put(Variable(_),e1) | Print(e1) | UBoolOp(e1):
+            return strict_in(name, e1)
+        case Cons(Variable(n),word):
+            return n==name or strict_in(name, word)
+        case Index(Variable(n),args):
+            return n==name or strict_in(name, args)
+        case Str_slicing(e1,start,end):
+            return any(strict_in(name, e) for e in (e1,start,end))
+        case Two_Str_concatenation(e1,e2):
+            return strict_in(name, e1) or strict_in(name, e2)
+        case BuiltinCall(_,args) | ListLiteral(args) | PVecLiteral(args) | SetLiteral(args):
+            return any(strict_in(name, arg) for arg in args)
+        case DictLiteral(keys,values):
+            return any(strict_in(name, e) for e in keys+values)
+    # function calls may or may not read their arguments
+    return False
+
+def is_strict(name: str, program: 'AST', cache: Dict) -> bool:
+    # strict_in, remembered in cache per (node, name); the node is kept
+    # in the entry so that its id isn't reused
+    key=(id(program),name)
+    entry=cache.get(key)
+    if entry is None:
+        entry=cache[key]=(program, strict_in(name, program))
+    return entry[1]
+
+def walk(program: 'AST'):
+    # program and all the nodes under it
+    yield program
+    for c in children(program):
+        yield from walk(c)
+
+def reads_variables(program: 'AST', cache: Dict) -> bool:
+    # whether program reads any variable or calls any func, remembered
+    # in the is_strict cache under the name None
+    key=(id(program),None)
+    entry=cache.get(key)
+    if entry is None:
+        entry=cache[key]=(program, any(isinstance(c, Variable) for c in walk(program)))
+    return entry[1]
+
+def delay(name: str, e1: 'AST', body: 'AST', environment: Environment):
+    # the value to bind name to: e1 evaluated now, or a thunk when lazy
+    # and body might not need it. A thunk that reads variables is forced
+    # before the next change to them, see Environment.settle.
+    if environment.lazy and not is_strict(name, body, environment.strict):
+        t=Thunk(e1, environment.fork())
+        if reads_variables(e1, environment.strict):
+            environment.pending.add(t)
+        return t
+    return eval(e1, environment)
+
+def contains_yield(program: AST) -> bool:
+    # whether a function body yields; yields in the bodies of nested
+    # functions belong to those functions
+    match program:
+        case Yield():
+            return True
+        case LetFun(_,_,_,expr):
+            return contains_yield(expr)
+    return any(contains_yield(c) for c in children(program))
+
+def owned(v: Value, environment: Environment) -> Value:
+    # v, or a copy of it if other runs share it, before it is changed in
+    # place; its elements are copied in turn when they are changed
+    if id(v) in environment.shared and isinstance(v, (list, dict, set)):
+        return v.copy()
+    return v
+
+# values whose length the size limit applies to
+SIZED = (list, str, Rope, StrView, ListView, PVector, dict, set)
+
+def grown(v: Value, environment: Environment) -> Value:
+    # v, once its length is checked against the size limit
+    if environment.budget is not None and isinstance(v, SIZED):
+        environment.budget.size(len(v))
+    return v
+
+def apply_fn(fn: FnObject, argv: List[Value], environment: Environment) -> Value:
+    # calls a user function from host code, the same way FunCall does
+    budget=environment.budget
+    if budget is not None:
+        budget.enter()
+    try:
+        if fn.generator:
+            # the body runs later, one step per value pulled, so it gets
+            # its own scope stack instead of pushing onto the caller's
+            genv=environment.fork()
+            genv.enter_scope()
+            for par,arg in zip(fn.params,argv):
+                genv.add(par.name,arg)
+            return gen_eval(fn.body, genv)
+        environment.enter_scope()
+        try:
+            for par,arg in zip(fn.params,argv):
+                environment.add(par.name,arg)
+            return eval(fn.body, environment)
+        finally:
+            # also when the call raises and the error is caught further up
+            environment.exit_scope()
+    finally:
+        if budget is not None:
+            budget.leave()
+
+# arithmetic on operands typecheck has proven to be numbers
+NUM_OPS = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.floordiv,
+    "%": operator.mod,
+    "&": operator.and_,
+}
+
+def eval(program: AST, environment: Environment = None) -> Value:
+    if environment is None:
+        environment = Environment()
+
+    def eval_(program):
+        return eval(program, environment) 
+    
+    match program:
+        case BuiltinCall(name,args):
+            b=natives.BUILTINS[name]
+            if b.rebinds:
+                # the first argument names the variable that receives the result
+                match args[0]:
+                    case Variable(vname):
+                        if environment.lazy:
+                            environment.settle()
+                        v=grown(b.fn(owned(environment.get(vname), environment),*[eval_(arg) for arg in args[1:]]), environment)
+                        environment.update(vname,v)
+                        return v
+                raise InvalidProgram()
+            argv=[eval_(arg) for arg in args]
+            if b.builds is not None and environment.budget is not None:
+                argv[b.builds]=natives.metered(argv[b.builds], environment.budget)
+            if b.env:
+                return grown(b.fn(environment,*argv), environment)
+            return grown(b.fn(*argv), environment)
+
+        case NumLiteral(value):
+            return value
+        case BoolLiteral(value):
+            return value
+
+        case StringLiteral(word):
+            return word
+        
+        case ListLiteral(elements):
+            return [eval_(element) for element in elements]
+
+        case Variable(name):
+            return environment.get(name)
+            
+        case Put(Variable(name),e1): 
+            v1=eval_(e1)
+            if environment.lazy:
+                environment.settle()
+            environment.update(name,v1)
+            return environment.get(name)
+        
+        case Get(Variable(name)):
+            return environment.get(name)
+
+        case Assign(Variable(name),e1):
+            v1=eval_(e1)
+            if environment.lazy:
+                environment.settle()
+            environment.add(name,v1)
+            return name
+
+        case Cons(Variable(name),word):
+            if environment.lazy:
+                environment.settle()
+            # print("hello")
+            List1=owned(environment.get(name), environment)
+            # print("hello")
+            if isinstance(List1,PVector):
+                List1=List1.appended(eval_(word))
+            else:
+                List1=natives.mutable_list(List1)
+                List1.append(eval_(word))
+            grown(List1, environment)
+            environment.update(name,List1)
+            
+            return environment.get(name)
+
+        case PVecLiteral(elements):
+            return PVector.from_iter(eval_(element) for element in elements)
+
+        case Let(Variable(name), e1, e2) | LetMut(Variable(name),e1, e2):
+            v1 = delay(name, e1, e2, environment)
+            environment.enter_scope()
+            environment.add(name,v1)
+            v2=eval_(e2)
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("env", "debug", "%s = %r leaving %d scopes", name, v1, len(environment.env))
+            environment.exit_scope()
+            return v2
+        
+        case Two_Str_concatenation(str1,str2):
+            result_str = Rope.concat(eval_(str1),eval_(str2))
+            return grown(result_str, environment)
+
+        # case Str_slicing(str1,start,end):
+        #     result_str = StringLiteral("")
+        #     i = Variable("i")
+        #     i = start
+        #     body1 = LetMut(i,Get(i),BinOp("+",i,NumLiteral(1)))
+        #     body2 = LetMut(result_str,Get(result_str),Two_Str_concatenation(result_str,str1[Get(i)]))
+        #     body = Seq([body1,body2])
+        #     condition = BinOp("<",i,end)
+        #     eval_(while_loop(condition,body))
+        #     return result_str
+
+        case Str_slicing(str1,start,end):
+            word = eval_(str1)
+            result_str = make_view(word,eval_(start),eval_(end))
+            return result_str
+            
+        case LetAnd(Variable(name1),expr1,Variable(name2),expr2,expr3):
+            v1=delay(name1, expr1, expr3, environment)
+            v2=delay(name2, expr2, expr3, environment)
+            environment.enter_scope()
+            if environment.lazy:
+                environment.settle()
+            if environment.check(name1):
+                environment.update(name1,v1)
+                
+            else:
+                environment.add(name1,v1)
+
+            if environment.check(name2):
+                environment.update(name2,v2)
+                
+            else:
+                environment.add(name2,v2)
+            
+            v3=eval_(expr3)
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("env", "debug", "%s = %r, %s = %r leaving %d scopes",
+                                       name1, v1, name2, v2, len(environment.env))
+            environment.exit_scope()
+            return v3
+
+        case LetFun(Variable(name),params, body,expr):
+            environment.enter_scope()
+            environment.add(name, FnObject(params,body,generator=contains_yield(body)))
+            v=eval_(expr)
+            environment.exit_scope()
+            return v
+        
+        
+        case FunCall(Variable(name),args):
+            fn=environment.get(name)
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("eval", "debug", "call %s", name)
+            argv=[]
+            for par,arg in zip(fn.params,args):
+                argv.append(delay(par.name, arg, fn.body, environment))
+            return apply_fn(fn, argv, environment)
+
+        case DictLiteral(keys,values):
+            return {eval_(k): eval_(v) for k,v in zip(keys,values)}
+
+        case Use(path,expr):
+            environment.use(path)
+            v=eval_(expr)
+            environment.exit_scope()
+            environment.exit_scope()
+            return v
+
+        case SetLiteral(elements):
+            return {eval_(element) for element in elements}
+
+        case UBoolOp(expr):
+            # dispatch on the type typecheck put on the operand; a tree
+            # that was never typechecked dispatches on the value instead
+            t=expr.type
+            v1=eval_(expr)
+            if t is None:
+                if isinstance(v1,(str,Rope,StrView)):
+                    t=StringType()
+                elif isinstance(v1,(int,Fraction)) and not isinstance(v1,bool):
+                    t=NumType()
+            match t:
+                case NumType():
+                    return v1 != 0
+                case StringType():
+                    return len(v1) != 0
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("eval", "error", "ubool of %r", v1)
+
+        case Two_Str_concatenation(str1,str2):
+            result_str = Rope.concat(eval_(str1),eval_(str2))
+            return result_str
+    
+
+        case Seq(body):
+            v1=None
+            for item in body:
+                v1=eval_(item)
+            return v1    
+
+        case BinOp(op, left, right, NumType()):
+            # typechecked as numbers on both sides, no operand checks needed
+            return NUM_OPS[op](eval_(left), eval_(right))
+        case BinOp("+", left, right):
+            v1=eval_(left)
+            if isinstance(v1,(str,Rope,StrView)):
+                return grown(Rope.concat(v1,eval_(right)), environment)
+            if isinstance(v1,(list,ListView,PVector)):
+                return grown(v1 + eval_(right), environment)
+            return v1 + eval_(right)
+        case BinOp("-", left, right):
+            return eval_(left) - eval_(right)
+        case BinOp("*", left, right):
+            v1=eval_(left)
+            v2=eval_(right)
+            if environment.budget is not None and isinstance(v1,(str,Rope,StrView,list)) and isinstance(v2,int):
+                # checked before the repetition is built
+                environment.budget.size(len(v1)*v2)
+            return v1 * v2
+        case BinOp("/", left, right):
+            return eval_(left) // eval_(right)
+        case BinOp("%", left, right):
+            return eval_(left) % eval_(right)
+        case BinOp(">",left,right):
+            return eval_(left) > eval_(right)
+        case BinOp("<", left,right):
+            return eval_(left) < eval_(right)
+        case BinOp("=", left,right):
+            return eval_(left) == eval_(right)
+        case BinOp ("or",left,right):
+            return eval_(left) or eval_(right)
+        case BinOp("and",left,right):
+            return eval_(left) and eval_(right)
+        
+        case BinOp("&",left,right):
+            return eval_(left) & eval_(right)
+        
+        case UnOp("not", expr):
+            return not(eval_(expr))
+        
+        case Index(Variable(name),args):
+            
+            fn=environment.get(name) 
+            v=eval_(args)
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("eval", "debug", "index %s [%r]", name, v)
+            return fn[v]
+
+        case if_else(expr,et,ef):
+            v1 = eval_(expr)
+            if v1 == True:
+                return eval_(et)
+            else:
+                return eval_(ef)
+                
+        case while_loop(condition,e1):
+            environment.enter_scope()
+            vcond = eval_(condition)
+            budget=environment.budget
+            while(vcond):
+                eval_(e1) 
+                if budget is not None:
+                    budget.tick()
+                vcond=eval_(condition)
+            environment.exit_scope()
+            return None
+
+        case foreach_loop(Variable(name),e1,body):
+            environment.enter_scope()
+            frame=environment.env[-1]
+            v1=None
+            budget=environment.budget
+            for x in eval_(e1):
+                if environment.pending:
+                    if environment.lazy:
+                        environment.settle()
+                frame[name]=x
+                v1=eval_(body)
+                if budget is not None:
+                    budget.tick()
+            environment.exit_scope()
+            return v1
+
+        case for_loop(Variable(name),e1,condition,updt,body):
+            environment.enter_scope()
+            environment.add(name,eval_(e1))
+            vcond=eval_(condition)
+            budget=environment.budget
+            while(vcond):
+                v1=eval_(body)
+                eval_(updt)
+                if budget is not None:
+                    budget.tick()
+                vcond=eval_(condition)    
+            environment.exit_scope()
+            return v1
+        
+        case Print(e1):
+            v1=eval_(e1)
+            print(v1, file=environment.out)
+            return v1
+
+    raise InvalidProgram()
+
+def gen_eval(program: AST, environment: Environment):
+    # evaluates the body of a generator function, producing each value
+    # it yields. Statements that can contain a yield are handled here;
+    # anything else is evaluated with eval.
+    def gen_(program):
+        return gen_eval(program, environment)
+
+    match program:
+        case Yield(e1):
+            yield eval(e1, environment)
+
+        case Seq(body):
+            for item in body:
+                yield from gen_(item)
+
+        case if_else(expr,et,ef):
+            if eval(expr, environment) == True:
+                yield from gen_(et)
+            else:
+                yield from gen_(ef)
+
+        case while_loop(condition,e1):
+            environment.enter_scope()
+            while eval(condition, environment):
+                yield from gen_(e1)
+                if environment.budget is not None:
+                    environment.budget.tick()
+            environment.exit_scope()
+
+        case for_loop(Variable(name),e1,condition,updt,body):
+            environment.enter_scope()
+            environment.add(name,eval(e1, environment))
+            while eval(condition, environment):
+                yield from gen_(body)
+                eval(updt, environment)
+                if environment.budget is not None:
+                    environment.budget.tick()
+            environment.exit_scope()
+
+        case foreach_loop(Variable(name),e1,body):
+            environment.enter_scope()
+            frame=environment.env[-1]
+            for x in eval(e1, environment):
+                if environment.pending:
+                    if environment.lazy:
+                        environment.settle()
+                frame[name]=x
+                yield from gen_(body)
+                if environment.budget is not None:
+                    environment.budget.tick()
+            environment.exit_scope()
+
+        case Let(Variable(name), e1, e2) | LetMut(Variable(name),e1, e2):
+            v1=delay(name, e1, e2, environment)
+            environment.enter_scope()
+            environment.add(name,v1)
+            yield from gen_(e2)
+            environment.exit_scope()
+
+        case LetAnd(Variable(name1),expr1,Variable(name2),expr2,expr3):
+            v1=delay(name1, expr1, expr3, environment)
+            v2=delay(name2, expr2, expr3, environment)
+            environment.enter_scope()
+            if environment.lazy:
+                environment.settle()
+            if environment.check(name1):
+                environment.update(name1,v1)
+            else:
+                environment.add(name1,v1)
+            if environment.check(name2):
+                environment.update(name2,v2)
+            else:
+                environment.add(name2,v2)
+            yield from gen_(expr3)
+            environment.exit_scope()
+
+        case LetFun(Variable(name),params, body,expr):
+            environment.enter_scope()
+            environment.add(name, FnObject(params,body,generator=contains_yield(body)))
+            yield from gen_(expr)
+            environment.exit_scope()
+
+        case Use(path,expr):
+            environment.use(path)
+            yield from gen_(expr)
+            environment.exit_scope()
+            environment.exit_scope()
+
+        case _:
+            eval(program, environment)
+
+def typed_eval(program: AST, environment: Environment = None) -> Value:
+    # typecheck runs once up front; eval then reads the types it left on
+    # the nodes instead of checking again at run time
+    return eval(typechecker.typecheck(program), environment)
@@ -0,0 +1,251 @@
+# Lexer: source text -> tokens.
+
+from dataclasses import dataclass
+
+
+class EndOfStream(Exception):
+    pass
+
+@dataclass
+# This defines a class named Stream, which will store information 
+# about a character stream
+class Stream:
+    # Stream contains the string and positon
+    source: str  
+    # This is an instance variable of the class, which stores the string data of the stream.
+    pos: int
+    #  stores the current position in the stream.
+    def from_string(s):
+        return Stream(s, 0)
+    # create stream object
+    def next_char(self):
+    #gets the next char from the stream
+        if self.pos >= len(self.source):
+            raise EndOfStream()
+        self.pos = self.pos + 1
+        return self.source[self.pos - 1]
+    def prev_char(self):
+    #gets the next char from the stream
+        if self.pos >= len(self.source):
+            raise EndOfStream()
+        self.pos = self.pos - 1
+        return self.source[self.pos - 1]
+
+    def unget(self):
+    #  move the position of the stream back by one character
+        assert self.pos > 0
+        self.pos = self.pos - 1
+
+# Define the token types.
+
+
+@dataclass
+class Num:
+    n: int
+
+@dataclass
+class Float:
+    n:float
+
+@dataclass
+class Bool:
+    b: bool
+
+@dataclass
+class Keyword:
+    word: str
+
+@dataclass
+class Identifier:
+    word: str
+
+@dataclass
+class Operator:
+    op: str
+
+@dataclass
+class String:
+    word: str
+
+class EndOfTokens():
+    pass
+
+Token = Num | Bool |Float | Keyword | Identifier | Operator | EndOfTokens | String
+
+
+keywords = set("if then else end len while index isEmpty lenSen do done let is in letMut letAnd of seq anth put get  printing for ubool func funCall assign slice lst listappend start stop plst foreach yield use".split())
+symbolic_operators = "+ - * & / < > ≤ ≥ = ≠ ; , % ( ) [ ]".split()
+word_operators = "and or not quot rem".split()
+whitespace = " \t\n"
+
+def word_to_token(word):
+    # the names of builtins called with parens, and of the dict and set
+    # literals, are identifiers: the parser tells them apart from
+    # variables by the ( or [ that follows
+    if word in keywords:
+        # print(word)
+        return Keyword(word)
+    
+    if word in word_operators:
+        # print(word)
+        return Operator(word)
+    if word == "True":
+        return Bool(True)
+    if word == "False":
+        return Bool(False)
+    return Identifier(word)
+
+class TokenError(Exception):
+    pass
+
+@dataclass
+class Lexer:
+    stream: Stream
+    save: Token = None
+    # an instance variable, named save of type Token with a default value of None.
+    # a trace.Tracer for the lexer and parser records, None for none
+    trace: object = None
+    def from_stream(s):
+        return Lexer(s)
+
+    def next_token(self) -> Token:
+        # returns the next token in the input stream
+        try:
+            match self.stream.next_char():
+                # case ">":
+                #     if self.stream.next_char()=="=":
+                #         return Operator(">=")
+                #     else:
+                #         self.stream.unget()
+                #         return Operator(">")
+        
+                
+                case c if c in symbolic_operators:
+                    # c1= self.stream.next_char()
+                    # c2=self.stream.prev_char()
+                    # b=c2.isdigit()
+                    # if c1.isdigit() and not b:
+                    #     n = int(c1)
+                    #     while True:
+                    #         try:
+                    #             c2 = self.stream.next_char()
+                    #             if c2.isdigit():
+                    #                 n = n*10 + int(c2)
+                    #             else:
+                    #                 self.stream.unget()
+                    #                 n=-n
+                    #                 print(-n)
+                    #                 return Num(-n)
+                    #         except EndOfStream:
+                    #             print(-n)
+                    #             return Num(-n)
+                    # else:
+                    
+                    return Operator(c)
+                
+                case '"':
+                    s=""
+                    try:
+                        c=self.stream.next_char()
+                        while c!='"':
+                            s+=c
+                            c=self.stream.next_char()
+                        return String(s)
+                    except EndOfStream:
+                        raise TokenError()
+
+                case c1 if c1=="-" and self.stream.next_char().isdigit():
+                    c=self.stream.next_char()
+                    n = int(c)
+                    while True:
+                        try:
+                            c = self.stream.next_char()
+                            if c.isdigit():
+                                n = n*10 + int(c)
+                            else:
+                                self.stream.unget()
+                                n=-n
+                                return Num(-n)
+                        except EndOfStream:
+                            return Num(-n)
+                case c if c.isdigit():
+                    n = int(c)
+                    while True:
+                        try:
+                            c = self.stream.next_char()
+                            if c.isdigit():
+                                n = n*10 + int(c)
+                            else:
+                                self.stream.unget()
+                                return Num(n)
+                        except EndOfStream:
+                            return Num(n)
+                case c if c.isalpha():
+                    s = c
+                    while True:
+                        try:
+                            c = self.stream.next_char()
+                            if c.isalpha():
+                                s = s + c
+                            else:
+                                self.stream.unget()
+                                return word_to_token(s)
+                        except EndOfStream:
+                            return word_to_token(s)
+                case c if c in whitespace:
+                    return self.next_token()
+        except EndOfStream:
+            # raise EndOfTokens
+            return EndOfTokens()
+
+    def peek_token(self) -> Token:
+
+# to look ahead in the stream to see the next token without 
+# actually consuming it. 
+        if self.save is not None:
+            return self.save
+        self.save = self.next_token()
+        if __debug__ and self.trace is not None:
+            self.trace.emit("lexer", "debug", "%r", self.save)
+        return self.save
+
+    def advance(self):
+        #  This method advances the stream to the next token.
+        assert self.save is not None
+        self.save = None
+
+    def match(self, expected):
+        # matches the current token with the expected token. 
+        # If the current token matches the expected token,
+        if self.peek_token() == expected:
+            return self.advance()
+        raise TokenError()
+
+    def __iter__(self):
+        #makes the Lexer class iterable
+        # so you can use a for loop to iterate over the tokens.
+        return self
+
+    def __next__(self):
+        # It calls next_token to get the next token
+        return self.next_token()
+        # try:
+        #     return self.next_token()
+        # # except EndOfTokens:
+        #     raise StopIteration
+
+
+def lex_tokens(source: str, pos: int = 0):
+    # (start, end, token) for every token of source from pos on
+    lexer=Lexer(Stream(source,pos))
+    n=len(source)
+    while True:
+        while pos<n and source[pos] in whitespace:
+            pos+=1
+        if pos>=n:
+            return
+        lexer.stream.pos=pos
+        lexer.save=None
+        t=lexer.next_token()
+        yield pos, lexer.stream.pos, t
+        pos=lexer.stream.pos
@@ -0,0 +1,80 @@
+# Execution budgets. A run given a Budget stops with LimitExceeded once
+# it has taken too many steps, too long, built too big a list or string,
+# or nested calls too deep. A step is one loop iteration or one call:
+# everything else a program does is bounded by its size, so the checks
+# are made only on loop back-edges and calls, plus a length check
+# where lists and strings grow. Builtins that build a list check its
+# length before building it, or count its elements as they are built.
+# Without a budget the evaluator only tests environment.budget for None
+# at those places.
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+import time
+
+@dataclass(frozen=True)
+class Limits:
+    # None is no limit
+    steps: Optional[int] = None
+    seconds: Optional[float] = None
+    size: Optional[int] = None
+    depth: Optional[int] = None
+
+class LimitExceeded(Exception):
+    # args: which limit ("steps", "seconds", "size" or "depth") and its value
+    pass
+
+# steps between two looks at the clock
+CLOCK_EVERY = 256
+
+class Budget:
+    # the limits of one run and what it has used of them so far
+    def __init__(self, limits: Limits):
+        self.limits=limits
+        self.max_steps=limits.steps if limits.steps is not None else float("inf")
+        self.max_size=limits.size if limits.size is not None else float("inf")
+        self.max_depth=limits.depth if limits.depth is not None else float("inf")
+        self.start=time.monotonic()
+        self.deadline=self.start+limits.seconds if limits.seconds is not None else None
+        self.steps=0
+        self.depth=0
+        self.peak_depth=0
+        self.peak_size=0
+
+    def tick(self):
+        self.steps+=1
+        if self.steps>self.max_steps:
+            raise LimitExceeded("steps", self.limits.steps)
+        if self.deadline is not None and not self.steps%CLOCK_EVERY and time.monotonic()>self.deadline:
+            raise LimitExceeded("seconds", self.limits.seconds)
+
+    def enter(self):
+        # a call
+        self.tick()
+        self.depth+=1
+        if self.depth>self.peak_depth:
+            self.peak_depth=self.depth
+            if self.depth>self.max_depth:
+                # the call doesn't happen, so it isn't left either
+                self.depth-=1
+                raise LimitExceeded("depth", self.limits.depth)
+
+    def leave(self):
+        self.depth-=1
+
+    def size(self, n: int):
+        # a list or string has grown to n
+        if n>self.peak_size:
+            self.peak_size=n
+            if n>self.max_size:
+                raise LimitExceeded("size", self.limits.size)
+
+    def built(self, n: int):
+        # a builtin has built n elements of its result so far
+        self.size(n)
+        if self.deadline is not None and not n%CLOCK_EVERY and time.monotonic()>self.deadline:
+            raise LimitExceeded("seconds", self.limits.seconds)
+
+    def usage(self) -> Dict:
+        return {"steps": self.steps, "seconds": time.monotonic()-self.start,
+                "size": self.peak_size, "depth": self.peak_depth}
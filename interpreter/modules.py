@@ -0,0 +1,85 @@
+# Modules: `use "helpers.toy" in expr end` makes the funcs of a module
+# file visible in expr. A module is parsed once and its funcs are kept as
+# one read-only frame, which every fragment that uses the module pushes
+# as a scope as it is, without copying it.
+
+from types import MappingProxyType
+from typing import Dict, Iterable, Optional
+import hashlib
+import os
+import pickle
+import stat
+import threading
+
+from .nodes import *
+from . import evaluator, lexer, parser
+
+class ModuleCache:
+    # path -> the module's frame, reloaded when the file changes. With a
+    # directory, the parsed funcs are also kept there as pickles, keyed
+    # by a hash of the module text, so a new process doesn't parse them
+    # again. With allowed, a list of files and directories, only those
+    # files and the files under those directories can be used, symlinks
+    # resolved; any other path raises PermissionError. Relative paths are
+    # taken from base, by default the current directory.
+    def __init__(self, directory: Optional[str] = None, allowed: Optional[Iterable[str]] = None,
+                 base: Optional[str] = None):
+        self.directory=directory
+        self.base=base
+        self.allowed=None if allowed is None else [os.path.realpath(p) for p in allowed]
+        self.modules: Dict={}
+        self.lock=threading.Lock()
+
+    def check(self, path: str):
+        if self.allowed is None:
+            return
+        real=os.path.realpath(path)
+        for p in self.allowed:
+            if real==p or real.startswith(os.path.join(p, "")):
+                return
+        raise PermissionError("module not allowed: %s" % path)
+
+    def load(self, path: str):
+        path=os.path.abspath(os.path.join(self.base or "", path))
+        self.check(path)
+        st=os.stat(path)
+        if not stat.S_ISREG(st.st_mode):
+            # a device or a pipe could be read forever
+            raise PermissionError("not a module file: %s" % path)
+        stamp=(st.st_mtime_ns,st.st_size)
+        entry=self.modules.get(path)
+        if entry is not None and entry[0]==stamp:
+            return entry[1]
+        with open(path) as f:
+            source=f.read()
+        frame=MappingProxyType({fn.name.name: FnObject(fn.params, fn.body, generator=evaluator.contains_yield(fn.body))
+                                for fn in self.parse(source)})
+        with self.lock:
+            self.modules[path]=(stamp,frame)
+        return frame
+
+    def parse(self, source: str):
+        if self.directory is None:
+            return parse_module(source)
+        key=hashlib.blake2b(source.encode(), digest_size=16).hexdigest()
+        cached=os.path.join(self.directory, key+".pickle")
+        try:
+            with open(cached, "rb") as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+        defs=parse_module(source)
+        os.makedirs(self.directory, exist_ok=True)
+        # written under another name first, so a reader never sees half a file
+        with open(cached+".%d" % os.getpid(), "wb") as f:
+            pickle.dump(defs, f, pickle.HIGHEST_PROTOCOL)
+        os.replace(cached+".%d" % os.getpid(), cached)
+        return defs
+
+def parse_module(source: str):
+    # module text -> its funcs, as LetFun nodes without an expr
+    return parser.Parser.from_lexer(lexer.Lexer.from_stream(lexer.Stream.from_string(source))).parse_module()
+
+# the cache of environments that aren't given one, shared by all the
+# fragments run in this process
+MODULES = ModuleCache()
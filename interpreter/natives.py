@@ -0,0 +1,337 @@
+# Builtin functions and their registry.
+
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+from bisect import bisect_left
+from itertools import islice
+
+from .nodes import *
+from .values import *
+from . import evaluator, typechecker
+
+# Builtin functions. Each one is a host Python function registered once
+# under its name; the parser turns a use into a BuiltinCall node and
+# eval and typecheck find the entry with a single dict lookup.
+@dataclass
+class Builtin:
+    name: str
+    fn: Callable
+    min_args: int
+    max_args: int
+    # maps the argument types to the result type, raising TypeError on
+    # a mismatch; None if the builtin can't be typechecked
+    signature: Optional[Callable] = None
+    # the first argument is a variable that is rebound to the result
+    rebinds: bool = False
+    # fn takes the Environment first, to call user functions
+    env: bool = False
+    # called as name(args) rather than name arg
+    parens: bool = True
+    # the argument the result is built from, element by element, which
+    # a run with a budget checks as it goes, see metered
+    builds: Optional[int] = None
+
+BUILTINS: Dict[str, Builtin] = {}
+
+def builtin(name, arity, signature=None, rebinds=False, env=False, parens=True, builds=None):
+    # decorator registering a host function as a builtin; arity is a
+    # number of arguments or a (min, max) pair
+    lo, hi = arity if isinstance(arity, tuple) else (arity, arity)
+    def register(fn):
+        BUILTINS[name] = Builtin(name, fn, lo, hi, signature, rebinds, env, parens, builds)
+        return fn
+    return register
+
+def fixed(params, result):
+    # signature with fixed argument and result types
+    def signature(types):
+        for p,t in zip(params,types):
+            join_type(p,t)
+        return result
+    return signature
+
+def sized(result):
+    # signature of len and isEmpty, which take any container or string
+    def signature(types):
+        if not isinstance(types[0],(ListType,DictType,SetType,StringType,type(None))):
+            raise TypeError()
+        return result
+    return signature
+
+def is_lazy(xs):
+    # generators and other one-shot iterators, as opposed to containers
+    return iter(xs) is xs
+
+def metered(xs, budget):
+    # xs, for a builtin building its result from it under budget. A
+    # container's length is checked against the size limit before
+    # anything is built; the elements of a range or an iterator are
+    # counted as they are taken, with the clock read as they go.
+    if not is_lazy(xs):
+        budget.size(len(xs))
+        if not isinstance(xs, range):
+            return xs
+    return counted(xs, budget)
+
+def counted(xs, budget):
+    for n,x in enumerate(xs, 1):
+        budget.built(n)
+        yield x
+
+def mutable_list(L):
+    # a list that can be changed in place; views and ranges are copied first
+    if isinstance(L,(ListView,range)):
+        return list(L)
+    return L
+
+@builtin("strlength", 1, fixed([StringType()], NumType()))
+def builtin_strlength(s):
+    return len(s)
+
+@builtin("reversestr", 1, fixed([StringType()], StringType()))
+def builtin_reversestr(s):
+    if isinstance(s,Rope):
+        s = str(s)
+    return s[::-1]
+
+@builtin("vowelnumb", 1, fixed([StringType()], NumType()))
+def builtin_vowelnumb(s):
+    if isinstance(s,Rope):
+        s = str(s)
+    count = 0
+    for ele in "aeiou":
+        count = count + s.count(ele)
+    return count
+
+@builtin("stringidx", 2, fixed([StringType(), NumType()], StringType()))
+def builtin_stringidx(s, i):
+    return s[i]
+
+@builtin("lenSen", 1, fixed([StringType()], NumType()), parens=False)
+def builtin_lenSen(s):
+    return len(as_str(s).split())
+
+@builtin("len", 1, sized(NumType()), parens=False)
+def builtin_len(c):
+    return len(c)
+
+@builtin("isEmpty", 1, sized(BoolType()), parens=False)
+def builtin_isEmpty(c):
+    return len(c) == 0
+
+def popval_type(types):
+    return ListType(list_of(types))
+
+@builtin("popval", 1, popval_type, rebinds=True)
+def builtin_popval(L):
+    if isinstance(L,PVector):
+        return L.popped()
+    L = mutable_list(L)
+    L.pop()
+    return L
+
+def listset_type(types):
+    join_type(list_of(types),types[2])
+    join_type(NumType(),types[1])
+    return ListType(join_type(list_of(types),types[2]))
+
+@builtin("listset", 3, listset_type, rebinds=True)
+def builtin_listset(L, i, v):
+    if isinstance(L,PVector):
+        return L.assoc(i,v)
+    L = mutable_list(L)
+    L[i] = v
+    return L
+
+@builtin("persist", 1, lambda ts: ListType(list_of(ts)), builds=0)
+def builtin_persist(L):
+    return PVector.from_iter(L)
+
+@builtin("copy", 1, lambda ts: ts[0], builds=0)
+def builtin_copy(v):
+    if isinstance(v,(str,Rope,StrView)):
+        return as_str(v)
+    if isinstance(v,(dict,set)):
+        return v.copy()
+    return list(v)
+
+# map and filter over a generator are lazy too, so a pipeline like
+# take(map(f, filter(g, source)), n) pulls one element at a time
+def call_type(fn, types):
+    # result type of a func passed to a builtin, checked where it was defined
+    if fn is None:
+        return None
+    if not isinstance(fn,FnType):
+        raise TypeError()
+    return typechecker.check_call(fn, types, fn.environment)
+
+def map_type(types):
+    return ListType(call_type(types[0],[elem_type(types[1])]))
+
+def filter_type(types):
+    et=elem_type(types[1])
+    join_type(BoolType(),call_type(types[0],[et]))
+    return ListType(et)
+
+def reduce_type(types):
+    acc=types[2]
+    return join_type(acc,call_type(types[0],[acc,elem_type(types[1])]))
+
+def sort_type(types):
+    et=elem_type(types[0])
+    if len(types)>1:
+        call_type(types[1],[et])
+    return ListType(et)
+
+@builtin("map", 2, map_type, env=True)
+def builtin_map(environment, f, xs):
+    if is_lazy(xs):
+        env=environment.fork()
+        return (evaluator.apply_fn(f, [x], env) for x in xs)
+    if environment.budget is not None:
+        # one result per element, checked before the calls
+        environment.budget.size(len(xs))
+    return [evaluator.apply_fn(f, [x], environment) for x in xs]
+
+@builtin("filter", 2, filter_type, env=True)
+def builtin_filter(environment, f, xs):
+    if is_lazy(xs):
+        env=environment.fork()
+        return (x for x in xs if evaluator.apply_fn(f, [x], env))
+    return [x for x in xs if evaluator.apply_fn(f, [x], environment)]
+
+@builtin("take", 2, lambda ts: ListType(elem_type(ts[0])))
+def builtin_take(xs, n):
+    # the first n elements; stops pulling from a generator after n
+    if is_lazy(xs):
+        return islice(xs, n)
+    return list(islice(xs, n))
+
+@builtin("collect", 1, lambda ts: ListType(elem_type(ts[0])), builds=0)
+def builtin_collect(xs):
+    return list(xs)
+
+@builtin("reduce", 3, reduce_type, env=True)
+def builtin_reduce(environment, f, xs, acc):
+    for x in xs:
+        acc = evaluator.apply_fn(f, [acc, x], environment)
+    return acc
+
+@builtin("sort", (1, 2), sort_type, env=True, builds=0)
+def builtin_sort(environment, xs, key=None):
+    if key is None:
+        return sorted(xs)
+    return sorted(xs, key=lambda x: evaluator.apply_fn(key, [x], environment))
+
+def contains_type(types):
+    match types[0]:
+        case DictType(kt,_):
+            join_type(kt,types[1])
+        case SetType(et) | ListType(et):
+            join_type(et,types[1])
+        case StringType():
+            join_type(StringType(),types[1])
+        case None:
+            pass
+        case _:
+            raise TypeError()
+    return BoolType()
+
+@builtin("contains", 2, contains_type)
+def builtin_contains(coll, elem):
+    if isinstance(coll,(str,Rope,StrView)):
+        return as_str(elem) in coll
+    return elem in coll
+
+def bsearch_type(types):
+    join_type(list_of(types),types[1])
+    return NumType()
+
+@builtin("bsearch", 2, bsearch_type)
+def builtin_bsearch(xs, v):
+    # xs must already be sorted; returns the index of v or -1
+    i = bisect_left(xs, v)
+    if i < len(xs) and xs[i] == v:
+        return i
+    return -1
+
+@builtin("range", (1, 3), fixed([NumType()]*3, ListType(NumType())))
+def builtin_range(*args):
+    # lazy: len, index, contains and iteration never build the list
+    return range(*args)
+
+def dict_of(types):
+    # the first argument must be a dict
+    if types[0] is None:
+        return DictType()
+    if not isinstance(types[0],DictType):
+        raise TypeError()
+    return types[0]
+
+def dictget_type(types):
+    d = dict_of(types)
+    join_type(d.key,types[1])
+    return d.value
+
+@builtin("dictget", 2, dictget_type)
+def builtin_dictget(d, k):
+    return d[k]
+
+def dictput_type(types):
+    d = dict_of(types)
+    return DictType(join_type(d.key,types[1]),join_type(d.value,types[2]))
+
+@builtin("dictput", 3, dictput_type, rebinds=True)
+def builtin_dictput(d, k, v):
+    d[k] = v
+    return d
+
+def setadd_type(types):
+    s=SetType() if types[0] is None else types[0]
+    if not isinstance(s,SetType):
+        raise TypeError()
+    return SetType(join_type(s.elem,types[1]))
+
+@builtin("setadd", 2, setadd_type, rebinds=True)
+def builtin_setadd(s, v):
+    s.add(v)
+    return s
+
+def remove_type(types):
+    match types[0]:
+        case DictType(kt,_):
+            join_type(kt,types[1])
+        case SetType(et):
+            join_type(et,types[1])
+        case None:
+            pass
+        case _:
+            raise TypeError()
+    return types[0]
+
+@builtin("remove", 2, remove_type, rebinds=True)
+def builtin_remove(c, k):
+    # removes a key from a dict or an element from a set
+    if isinstance(c,dict):
+        c.pop(k,None)
+    else:
+        c.discard(k)
+    return c
+
+def keys_type(types):
+    match types[0]:
+        case DictType(kt,_):
+            return ListType(kt)
+        case SetType(et):
+            return ListType(et)
+        case None:
+            return ListType()
+    raise TypeError()
+
+@builtin("keys", 1, keys_type, builds=0)
+def builtin_keys(c):
+    return list(c)
+
+@builtin("values", 1, lambda types: ListType(dict_of(types).value), builds=0)
+def builtin_values(d):
+    return list(d.values())
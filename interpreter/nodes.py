@@ -0,0 +1,403 @@
+# Types and AST nodes, shared by all the other modules.
+
+from fractions import Fraction
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Optional, Dict, List
+
+# Types are frozen so they can be shared as dataclass defaults and used
+# as dict keys.
+@dataclass(frozen=True)
+class NumType:
+    pass
+@dataclass(frozen=True)
+class FloatType:
+    pass
+
+@dataclass(frozen=True)
+class BoolType:
+    pass
+@dataclass(frozen=True)
+class StringType:
+    pass
+
+# Container types. A None element type means "not known yet", e.g. for
+# an empty literal.
+@dataclass(frozen=True)
+class ListType:
+    elem: Optional['SimType'] = None
+
+@dataclass(frozen=True)
+class DictType:
+    key: Optional['SimType'] = None
+    value: Optional['SimType'] = None
+
+@dataclass(frozen=True)
+class SetType:
+    elem: Optional['SimType'] = None
+
+@dataclass(eq=False)
+class FnType:
+    # the type of a func. The body is checked again for every list of
+    # argument types it is called with, so functions are polymorphic.
+    params: List['AST']
+    body: 'AST' = field(repr=False)
+    environment: 'Environment' = field(repr=False)
+    # argument types -> (typed body, result type); None while the body
+    # is being checked, i.e. for recursive calls
+    calls: Dict = field(default_factory=dict, repr=False)
+    recursive: set = field(default_factory=set, repr=False)
+    # the body belongs to a cached module, shared by every fragment that
+    # uses it, so it is never typed in place
+    shared: bool = False
+
+SimType = NumType | BoolType | StringType | FloatType | ListType | DictType | SetType | FnType
+
+@dataclass
+#  The _init_ method takes any number of arguments and passes them to the Fraction constructor to create a new Fraction object, which is then stored in the value field.
+class NumLiteral:
+    value: Fraction
+    type: SimType = NumType()
+    # def __init__(self, *args):
+    #     self.value = Fraction(*args)
+
+@dataclass
+class FloatLiteral:
+    value: float
+    type: SimType = FloatType()
+
+@dataclass
+class StringLiteral:
+    word : str 
+    type: SimType = StringType()
+
+@dataclass
+class Integer:
+    value:int
+    type:SimType=NumType()
+
+@dataclass
+# this is kind of binary operation
+class BinOp:                      
+    operator: str      # '+' is the operator in addition
+    # below are kind of two no. to be added
+    left: 'AST'
+    right: 'AST'
+
+    type: Optional[SimType] = None
+
+
+@dataclass
+class Variable:
+    name: str
+    type: Optional[SimType] = None
+
+
+@dataclass
+class StringLiteral:
+    word : str 
+    type: SimType = StringType()
+
+
+@dataclass
+class Let:
+    var: 'AST'
+    e1: 'AST'
+    e2: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+class BoolLiteral:
+    value: bool
+    type: SimType = BoolType()
+
+
+@dataclass
+class if_else:
+    expr: 'AST'
+    et: 'AST'    #statement if expr is true
+    ef: 'AST'    #statement if expr is false
+    type: Optional[SimType] = None
+
+
+@dataclass
+class while_loop:
+    condition: 'AST'
+    body: 'AST'
+    type: Optional[SimType] = None
+
+
+@dataclass
+class for_loop:
+    var: 'AST'
+    expr: 'AST'
+    condition: 'AST'
+    updt: 'AST'
+    body: 'AST'
+    type: Optional[SimType] = None
+
+
+@dataclass
+class foreach_loop:
+    var: 'AST'
+    iterable: 'AST'     # list, string, range, dict or set
+    body: 'AST'
+    type: Optional[SimType] = None
+
+
+@dataclass
+class Two_Str_concatenation:
+    str1: 'AST'
+    str2: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+
+class Str_slicing:
+    str1: 'AST'
+    start: 'AST'
+    end: 'AST'
+    type: Optional[SimType] = None
+
+
+@dataclass
+class LetMut:
+    var: 'AST'
+    e1: 'AST'
+    e2: 'AST'
+    type: Optional[SimType] = None
+
+
+@dataclass
+class Seq:
+    body: List['AST']
+    type: Optional[SimType] = None
+
+
+@dataclass
+class Put:
+    var: 'AST'
+    e1: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+
+class Assign:
+    var: 'AST'
+    e1: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+
+class Get:
+    var: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+class Print:
+    e1: 'AST'
+    type: Optional[SimType] = None
+
+
+@dataclass
+class LetFun:
+    name:'AST'
+    params:List['AST']
+    body:'AST'
+    expr:'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+class FunCall:
+    fn:'AST'
+    args: List['AST']
+    type: Optional[SimType] = None
+
+@dataclass
+class FnObject:
+    params: List['AST']
+    body: 'AST'
+    type: Optional[SimType] = None
+    # the body contains a yield, calling it returns a generator
+    generator: bool = False
+
+@dataclass
+class Yield:
+    # only valid inside the body of a func
+    e1: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+class Use:
+    # use "path.toy" in expr end: the funcs of a module, visible in expr
+    path: str
+    expr: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+class LetAnd:
+    var1:'AST'
+    expr1: 'AST'
+    var2:'AST'
+    expr2:'AST'
+    expr3:'AST'
+    type: Optional[SimType] = None
+@dataclass
+class UBoolOp:
+    expr: 'AST' 
+    type: Optional[SimType] = None
+@dataclass 
+class UnOp:
+    operator: str 
+    expr: 'AST'
+    type: Optional[SimType] = None
+
+@dataclass
+class ListLiteral:
+    elements: List['AST']
+    type: Optional[SimType] = None
+
+@dataclass
+class Cons():
+    list1: List['AST']
+    word: 'AST'
+    type: Optional[SimType] = None
+    
+@dataclass
+class Index:
+    v:'AST'
+    idx:'AST' 
+    type: Optional[SimType] = None
+
+@dataclass
+class BuiltinCall:
+    # call of a function registered in BUILTINS, e.g. strlength(s)
+    name: str
+    args: List['AST']
+    type: Optional[SimType] = None
+
+# Persistent lists. Cons, popval and listset on a persistent list
+# rebind the variable to a new version, older versions stay valid.
+@dataclass
+class PVecLiteral:
+    elements: List['AST']
+    type: Optional[SimType] = None
+
+# Hash map and set values, backed by Python dict and set.
+@dataclass
+class DictLiteral:
+    keys: List['AST']
+    values: List['AST']
+    type: Optional[SimType] = None
+
+@dataclass
+class SetLiteral:
+    elements: List['AST']
+    type: Optional[SimType] = None
+
+    # def __init__(self, elements=None):
+    #     self.elements = elements or []
+
+    # def cons(self, element):
+    #     self.elements.append(element)
+
+    # def is_empty(self):
+    #     return not bool(self.elements)
+
+    # def head(self):
+    #     if self.is_empty():
+    #         return None
+    #     return self.elements[0]
+
+    # def tail(self):
+    #     if self.is_empty():
+    #         return None
+    #     return self.elements[1:]
+
+# environment = Environment()
+
+# Define the 'eval_list' function
+# def eval_list(lst, env):
+#     result = []
+#     for i in range(len(lst.elements)):
+#         result.append(eval(lst.elements[i], env))
+#     return List(result)
+
+# # Create a list and evaluate it
+# my_list = List([NumLiteral(1), NumLiteral(2), NumLiteral(3)])
+# v = eval_list(my_list, environment)
+
+# Add the result to the environment
+# environment.add("my_list", v)
+
+# Define the 'is_empty' operation for the List class
+# def is_empty(lst):
+#     return len(lst.elements) == 0
+
+# # Define the 'head' operation for the List class
+# def head(lst):
+#     if is_empty(lst):
+#         raise Exception("List is empty")
+#     return lst.elements[0]
+
+# # Define the 'tail' operation for the List class
+# def tail(lst):
+#     if is_empty(lst):
+#         raise Exception("List is empty")
+#     return List(lst.elements[1:])
+
+
+
+AST = NumLiteral | BoolLiteral | StringLiteral | Index | FloatLiteral | ListLiteral | Cons | BinOp | Variable | Let | if_else | LetMut | Put | Get | Assign |Seq | Print | while_loop | foreach_loop | FunCall | Yield | StringLiteral | UBoolOp | LetAnd | Str_slicing | Two_Str_concatenation | BuiltinCall | PVecLiteral | DictLiteral | SetLiteral | Use
+# TypedAST = NewType('TypedAST', AST)
+class InvalidProgram(Exception):
+    pass
+
+class TypeError(Exception):
+    pass
+
+def join_type(t1: Optional[SimType], t2: Optional[SimType]) -> Optional[SimType]:
+    # combines two types that must agree, None is an unknown type
+    if t1 is None:
+        return t2
+    if t2 is None:
+        return t1
+    match t1, t2:
+        case ListType(e1), ListType(e2):
+            return ListType(join_type(e1,e2))
+        case SetType(e1), SetType(e2):
+            return SetType(join_type(e1,e2))
+        case DictType(k1,v1), DictType(k2,v2):
+            return DictType(join_type(k1,k2),join_type(v1,v2))
+    if t1 != t2:
+        raise TypeError()
+    return t1
+
+def list_of(types, i=0):
+    # element type of the i-th argument, which must be a list
+    if types[i] is None:
+        return None
+    if not isinstance(types[i],ListType):
+        raise TypeError()
+    return types[i].elem
+
+def elem_type(t):
+    # the type of the elements foreach and the bulk operations see
+    match t:
+        case ListType(et) | SetType(et) | DictType(et,_):
+            return et
+        case StringType():
+            return StringType()
+        case None:
+            return None
+    raise TypeError()
+
+def children(program: AST):
+    # the direct sub-expressions of an AST node
+    for f in fields(program):
+        v=getattr(program,f.name)
+        if isinstance(v,list):
+            for item in v:
+                if is_dataclass(item):
+                    yield item
+        elif is_dataclass(v) and f.name!="type":
+            yield v
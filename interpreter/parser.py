@@ -0,0 +1,893 @@
+# Parser: tokens -> AST, plus the incremental front end for editors.
+
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Optional
+from itertools import islice
+
+from .lexer import *
+from .nodes import *
+from .natives import BUILTINS
+
+@dataclass
+class Parser:
+    lexer: Lexer
+
+    def from_lexer(lexer):
+        return Parser(lexer)
+
+    def parse_if(self):
+        #The match method is called on the Lexer object to check that the 
+        # next token in the stream
+        self.lexer.match(Keyword("if"))
+        c = self.parse_expr()
+        self.lexer.match(Keyword("then"))
+        t = self.parse_expr()
+        self.lexer.match(Keyword("else"))
+        f = self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return if_else(c, t, f)
+    
+    def parse_let(self):
+        self.lexer.match(Keyword("let"))
+        v=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        e=self.parse_expr()
+        self.lexer.match(Keyword("in"))
+        b=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return Let(v,e,b)
+    
+    def parse_LetMut(self):
+        self.lexer.match(Keyword("letMut"))
+        v=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        e=self.parse_expr()
+        self.lexer.match(Keyword("in"))
+        b=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return LetMut(v,e,b)
+    
+    def parse_LetAnd(self):
+        self.lexer.match(Keyword("letAnd"))
+        v1=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        e1=self.parse_expr()
+        self.lexer.match(Operator(";"))
+        v2=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        e2=self.parse_expr()
+        self.lexer.match(Keyword("in"))
+        b=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return LetAnd(v1,e1,v2,e2,b)
+    
+    def parse_Seq(self):
+        self.lexer.match(Keyword("seq"))
+        lst=[]
+        #10
+        while True:
+            match self.lexer.peek_token():
+                case Keyword("end"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        lst.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(";"):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        #12
+        # e1=self.parse_expr()
+        # lst.append(e1)
+        # self.lexer.match(Operator(";"))
+        # e2=self.parse_expr()
+        # lst.append(e2)
+        # self.lexer.match(Keyword("end"))
+
+        #13
+        # print(" helloo ")
+        # a=True
+        # while a:
+            
+        #     e1=self.parse_expr()
+        #     lst.append(e1)
+        #     print(" helloo 123")
+        #     self.lexer.match(Keyword(" "))
+        #     if self.lexer.match(Keyword("end")):
+        #         a=False
+        return Seq(lst)
+
+    def parse_put(self):
+        self.lexer.match(Keyword("put"))
+        v=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        e=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return Put(v,e)
+    
+    def parse_get(self):
+        self.lexer.match(Keyword("get"))
+        v=self.parse_expr()
+        return Get(v)
+    
+    def parse_ListLiteral(self):
+        self.lexer.match(Keyword("lst"))
+        self.lexer.match(Operator("["))
+        params=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator("]"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        params.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        return ListLiteral(params)    
+
+        
+
+    def parse_assign(self):
+        self.lexer.match(Keyword("assign"))
+        v1=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        v2=self.parse_expr()
+        return Assign(v1,v2)
+    
+    def parse_index(self):
+        self.lexer.match(Keyword("index"))
+        match self.lexer.peek_token():
+            case Identifier(name):
+                # a variable, even one named like a literal or builtin
+                self.lexer.advance()
+                a=Variable(name)
+            case _:
+                a=self.parse_expr()
+        self.lexer.match(Operator("["))
+        b=self.parse_expr()
+        self.lexer.match(Operator("]"))
+        return Index(a,b)
+    
+    def parse_StrSlice(self):
+        self.lexer.match(Keyword("slice"))
+        a = self.parse_expr()
+        self.lexer.match(Keyword("start"))
+        b = self.parse_expr()
+        self.lexer.match(Keyword("stop"))
+        c = self.parse_expr()
+        return Str_slicing(a,b,c)
+
+    def parse_Cons(self):
+        # print("enter")
+        self.lexer.match(Keyword("listappend"))
+        a = self.parse_expr()
+        self.lexer.match(Keyword("in"))
+        b = self.parse_expr()
+        # print("leave")
+        return Cons(b,a)
+
+    def parse_args(self):
+        # parses a parenthesised, comma separated argument list
+        self.lexer.match(Operator("("))
+        args=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator(")"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        args.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        return args
+
+    def parse_builtin(self, name):
+        # the arguments of builtin name, read already: name(args) for most
+        # builtins, name arg for len, isEmpty, lenSen
+        b = BUILTINS[name]
+        if b.parens:
+            args = self.parse_args()
+        else:
+            args = [self.parse_expr()]
+        if not b.min_args <= len(args) <= b.max_args:
+            raise TokenError()
+        return BuiltinCall(b.name, args)
+
+    def parse_PVecLiteral(self):
+        self.lexer.match(Keyword("plst"))
+        self.lexer.match(Operator("["))
+        params=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator("]"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        params.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        return PVecLiteral(params)
+
+    def parse_DictLiteral(self):
+        # dict [key is value, ...], dict read already
+        self.lexer.match(Operator("["))
+        keys=[]
+        values=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator("]"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        keys.append(self.parse_expr())
+                        self.lexer.match(Keyword("is"))
+                        values.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        return DictLiteral(keys,values)
+
+    def parse_SetLiteral(self):
+        # set [elem, ...], set read already
+        self.lexer.match(Operator("["))
+        params=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator("]"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        params.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        return SetLiteral(params)
+
+    def parse_yield(self):
+        self.lexer.match(Keyword("yield"))
+        v=self.parse_expr()
+        return Yield(v)
+
+    def parse_printing(self):
+        self.lexer.match(Keyword("printing"))
+        v=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return Print(v)
+    
+    def parse_ubool(self):
+        self.lexer.match(Keyword("ubool"))
+        v=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return UBoolOp(v)
+    
+    def parse_while(self):
+        self.lexer.match(Keyword("while"))
+        c = self.parse_expr()
+        self.lexer.match(Keyword("do"))
+        b = self.parse_expr()
+        self.lexer.match(Keyword("done"))
+        return while_loop(c, b)
+    
+    def parse_foreach(self):
+        # foreach x in iterable do body done
+        self.lexer.match(Keyword("foreach"))
+        a=self.parse_expr()
+        self.lexer.match(Keyword("in"))
+        b=self.parse_expr()
+        self.lexer.match(Keyword("do"))
+        c=self.parse_expr()
+        self.lexer.match(Keyword("done"))
+        return foreach_loop(a,b,c)
+
+    def parse_for(self):
+        self.lexer.match(Keyword("for"))
+        a=self.parse_expr()
+        self.lexer.match(Keyword("is"))
+        b=self.parse_expr()
+        self.lexer.match(Operator(";"))
+        c=self.parse_expr()
+        self.lexer.match(Operator(";"))
+        d=self.parse_expr()
+        self.lexer.match(Operator(";"))
+        e=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        
+        return for_loop(a,b,c,d,e)
+
+    def parse_LetFun(self):
+        a,params,body=self.parse_fn_def()
+        self.lexer.match(Operator(","))
+        expr=self.parse_expr()
+        return LetFun(a,params,body,expr)
+
+    def parse_fn_def(self):
+        # func name(params) body
+        self.lexer.match(Keyword("func"))
+        a=self.parse_expr()
+        self.lexer.match(Operator("("))
+        params=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator(")"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        params.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break    
+            
+        body=self.parse_expr()
+        return a,params,body
+
+    def parse_module(self):
+        # the funcs of a module file, optionally separated by commas
+        defs=[]
+        while not isinstance(self.lexer.peek_token(), EndOfTokens):
+            a,params,body=self.parse_fn_def()
+            defs.append(LetFun(a,params,body,None))
+            match self.lexer.peek_token():
+                case Operator(","):
+                    self.lexer.advance()
+        return defs
+
+    def parse_use(self):
+        self.lexer.match(Keyword("use"))
+        match self.lexer.peek_token():
+            case String(path):
+                self.lexer.advance()
+            case _:
+                raise InvalidProgram()
+        self.lexer.match(Keyword("in"))
+        e=self.parse_expr()
+        self.lexer.match(Keyword("end"))
+        return Use(path,e)
+    
+    def parse_FunCall(self):
+        self.lexer.match(Keyword("funCall"))
+        a=self.parse_expr()
+        self.lexer.match(Operator("("))
+        params=[]
+        while True:
+            match self.lexer.peek_token():
+                case Operator(")"):
+                    self.lexer.advance()
+                    break
+                case _:
+                    while True:
+                        params.append(self.parse_expr())
+                        match self.lexer.peek_token():
+                            case Operator(","):
+                                self.lexer.advance()
+                                continue
+                            case _:
+                                break
+        return FunCall(a,params)
+
+
+    def parse_atom(self):
+        # checks the type of the next token
+        match self.lexer.peek_token():
+            case Identifier(name):
+                self.lexer.advance()
+                match self.lexer.peek_token():
+                    case Operator("(") if name in BUILTINS and BUILTINS[name].parens:
+                        return self.parse_builtin(name)
+                    case Operator("[") if name=="dict":
+                        return self.parse_DictLiteral()
+                    case Operator("[") if name=="set":
+                        return self.parse_SetLiteral()
+                return Variable(name)
+            case Num(value):
+                self.lexer.advance()
+                return NumLiteral(value)
+            case Bool(value):
+                self.lexer.advance()
+                return BoolLiteral(value)
+            case Keyword("funCall"):     
+                return self.parse_FunCall()
+            case Operator(op = '('):
+                self.lexer.advance()
+                expr_ = self.parse_add()
+                match self.lexer.peek_token():
+                    case Operator(op = ')'):
+                        self.lexer.advance()
+                        return expr_
+            case String(word):
+                self.lexer.advance()
+                return StringLiteral(word)
+    
+
+    def parse_mult(self):
+        left = self.parse_atom()
+        while True:
+            match self.lexer.peek_token():
+                case Operator(op) if op in "*/%":
+                    self.lexer.advance()
+                    m = self.parse_atom()
+                    left = BinOp(op, left, m)
+                case _:
+                    break
+        return left
+
+    def parse_add(self):
+        left = self.parse_mult()
+        while True:
+            match self.lexer.peek_token():
+                case Operator(op) if op in "+-":
+                    self.lexer.advance()
+                    m = self.parse_mult()
+                    left = BinOp(op, left, m)
+                case _:
+                    break
+        return left
+    
+    
+
+            
+    
+    def parse_bitand(self):
+        left = self.parse_add()
+        # print("no")
+        match self.lexer.peek_token():
+            case Operator("&"):
+                self.lexer.advance()
+                right = self.parse_add()
+                return BinOp("&", left, right)
+        return left
+    
+    def parse_cmp(self):
+        left = self.parse_bitand()
+        match self.lexer.peek_token():
+            case Operator(op) if op in "<>=":
+                self.lexer.advance()
+                right = self.parse_bitand()
+                return BinOp(op, left, right)
+        return left
+    
+    def parse_not(self):
+        
+        match self.lexer.peek_token():
+            case Operator("not"):
+                self.lexer.advance()
+                right = self.parse_cmp()
+                return UnOp("not",right)
+            case _:
+                return self.parse_cmp()
+    def parse_or(self):
+        left = self.parse_not()
+        match self.lexer.peek_token():
+            case Operator("or"):
+                self.lexer.advance()
+                right = self.parse_not()
+                return BinOp("or", left, right)
+        return left
+    def parse_and(self):
+        left = self.parse_or()
+        match self.lexer.peek_token():
+            case Operator("and"):
+                self.lexer.advance()
+                right = self.parse_or()
+                return BinOp("and", left, right)
+        return left
+    
+
+    def parse_simple(self):
+        return self.parse_and()
+
+    def parse_expr(self):
+        #which handles the different cases for a valid expression: 
+        # if-else, while loop or 
+        # simple expression (a combination of basic mathematical operations 
+        # like addition, subtraction, multiplication, and division and comparison operations like less than, greater than).
+        if __debug__ and self.lexer.trace is not None:
+            self.lexer.trace.emit("parser", "debug", "expr at %r", self.lexer.peek_token())
+        match self.lexer.peek_token():
+            case Keyword(word) if word in BUILTINS and not BUILTINS[word].parens:
+                self.lexer.advance()
+                return self.parse_builtin(word)
+            case Keyword(word) if word in keyword_parsers:
+                return keyword_parsers[word](self)
+            case _:
+                return self.parse_simple()
+
+# Parsers for the keywords that start a special form; parse_expr looks
+# them up here instead of trying each keyword in turn. Builtin function
+# names are looked up in BUILTINS, name(args) calls are parsed as atoms
+# so they can be used as operands.
+keyword_parsers = {
+    "if": Parser.parse_if,
+    "while": Parser.parse_while,
+    "for": Parser.parse_for,
+    "foreach": Parser.parse_foreach,
+    "let": Parser.parse_let,
+    "letMut": Parser.parse_LetMut,
+    "put": Parser.parse_put,
+    "get": Parser.parse_get,
+    "assign": Parser.parse_assign,
+    "letAnd": Parser.parse_LetAnd,
+    "seq": Parser.parse_Seq,
+    "printing": Parser.parse_printing,
+    "yield": Parser.parse_yield,
+    "ubool": Parser.parse_ubool,
+    "func": Parser.parse_LetFun,
+    "funCall": Parser.parse_FunCall,
+    "slice": Parser.parse_StrSlice,
+    "listappend": Parser.parse_Cons,
+    "lst": Parser.parse_ListLiteral,
+    "index": Parser.parse_index,
+    "plst": Parser.parse_PVecLiteral,
+    "use": Parser.parse_use,
+}
+
+def parse(source: str, trace=None) -> 'AST':
+    # source text of one fragment -> AST; trace is a trace.Tracer
+    return Parser.parse_expr(Parser.from_lexer(Lexer(Stream.from_string(source), trace=trace)))
+
+# Incremental front end, for editors. A SourceTree keeps the tokens of a
+# fragment and the span of every parse_expr in the AST. An edit re-lexes
+# only the tokens around it, until the new tokens line up with the old
+# ones again, and re-parses only the smallest parse_expr that contains
+# them. Tokens are stored by width rather than by offset, in blocks, so
+# an edit never has to touch the positions of the rest of the fragment.
+
+@dataclass(eq=False)
+class Tok:
+    token: Token
+    # from the start of this token to the start of the next one
+    width: int
+    block: 'TokenBlock' = None
+    # innermost parse_expr that consumed the token
+    span: 'Span' = None
+
+BLOCK = 256
+
+class TokenBlock:
+    # a run of at most BLOCK tokens and their total width
+    def __init__(self, toks):
+        self.toks=toks
+        self.width=0
+        for t in toks:
+            t.block=self
+            self.width+=t.width
+
+@dataclass(eq=False)
+class Span:
+    node: 'AST'
+    first: Optional[Tok]
+    last: Optional[Tok]
+    parent: Optional['Span']
+    # where the parent's tree refers to node: (holder, field, list index)
+    slot: Optional[tuple] = None
+
+class TokenCursor:
+    # the lexer interface Parser uses, over stored tokens
+    trace = None
+
+    def __init__(self, toks, i, owners):
+        self.toks=toks
+        self.i=i
+        self.cur=next(toks,None)
+        self.last=None
+        self.owners=owners
+        # (token, span) for every token consumed, applied once the parse
+        # is known to fit
+        self.taken=[]
+
+    def peek_token(self):
+        if self.cur is None:
+            return EndOfTokens()
+        return self.cur.token
+
+    def advance(self):
+        self.taken.append((self.cur,self.owners[-1]))
+        self.last=self.cur
+        self.cur=next(self.toks,None)
+        self.i+=1
+
+    def match(self, expected):
+        if self.peek_token() == expected:
+            return self.advance()
+        raise TokenError()
+
+class RecordingParser(Parser):
+    # records a Span for every parse_expr
+    def __init__(self, cursor, parent):
+        self.lexer=cursor
+        self.owners=cursor.owners
+        self.owners.append(parent)
+        self.kids=[[]]
+
+    def parse_expr(self):
+        c=self.lexer
+        first=c.cur
+        start=c.i
+        span=Span(None,None,None,self.owners[-1])
+        self.kids[-1].append(span)
+        self.owners.append(span)
+        self.kids.append([])
+        try:
+            node=Parser.parse_expr(self)
+        finally:
+            self.owners.pop()
+            kids=self.kids.pop()
+        span.node=node
+        if c.i>start:
+            span.first=first
+            span.last=c.last
+        if kids and node is not None:
+            find_slots(node, {id(k.node): k for k in kids if k.node is not None})
+        return node
+
+def find_slots(node, kids):
+    # sets the slot of every kid span whose node is referenced from
+    # node's tree, without going into the kids' own trees
+    for f in fields(node):
+        if f.name=="type":
+            continue
+        v=getattr(node,f.name)
+        if isinstance(v,list):
+            for j,x in enumerate(v):
+                if id(x) in kids:
+                    kids[id(x)].slot=(node,f.name,j)
+                elif is_dataclass(x):
+                    find_slots(x, kids)
+        elif id(v) in kids:
+            kids[id(v)].slot=(node,f.name,None)
+        elif is_dataclass(v):
+            find_slots(v, kids)
+
+class SourceTree:
+    # a fragment kept up to date under edits, see edit
+    def __init__(self, source: str):
+        self.source=source
+        self.rebuild()
+
+    def rebuild(self):
+        # lexes and parses the whole fragment from scratch
+        self.blocks=[]
+        self.lead=0
+        try:
+            k,toks=self.relex(0,0,self.source,0,len(self.source))
+        except TokenError as e:
+            # e.g. an unterminated string; the next edit starts over
+            self.lexed=False
+            self.root=None
+            self.error=e
+            return
+        self.lexed=True
+        self.splice(0,0,toks)
+        self.reparse(None,0,None)
+
+    @property
+    def program(self) -> 'AST':
+        return None if self.root is None else self.root.node
+
+    def count(self):
+        return sum(len(b.toks) for b in self.blocks)
+
+    def tokens(self):
+        for b in self.blocks:
+            yield from b.toks
+
+    def iter_from(self, i):
+        for b in self.blocks:
+            if i<len(b.toks):
+                yield from islice(b.toks,i,None)
+                i=0
+            else:
+                i-=len(b.toks)
+
+    def index_of(self, tok):
+        n=0
+        for b in self.blocks:
+            if b is tok.block:
+                return n+b.toks.index(tok)
+            n+=len(b.toks)
+        raise KeyError()
+
+    def locate(self, offset):
+        # index and start of the token whose width covers offset
+        pos=self.lead
+        i=0
+        for b in self.blocks:
+            if pos+b.width>offset:
+                for t in b.toks:
+                    if pos+t.width>offset:
+                        return i,pos
+                    pos+=t.width
+                    i+=1
+            pos+=b.width
+            i+=len(b.toks)
+        if i==0:
+            return 0,self.lead
+        last=self.blocks[-1].toks[-1]
+        return i-1,pos-last.width
+
+    def tok_at(self, i):
+        for b in self.blocks:
+            if i<len(b.toks):
+                return b.toks[i]
+            i-=len(b.toks)
+        raise IndexError()
+
+    def splice(self, i, k, toks):
+        # replaces tokens [i, k) with toks, rebuilding only the blocks hit.
+        # The replaced tokens are marked dead by clearing their block.
+        for t in islice(self.iter_from(i),k-i):
+            t.block=None
+        bi=0
+        while bi<len(self.blocks)-1 and i>=len(self.blocks[bi].toks):
+            i-=len(self.blocks[bi].toks)
+            k-=len(self.blocks[bi].toks)
+            bi+=1
+        bk=bi
+        while bk<len(self.blocks)-1 and k>len(self.blocks[bk].toks):
+            k-=len(self.blocks[bk].toks)
+            bk+=1
+        if self.blocks:
+            toks=self.blocks[bi].toks[:i]+toks+self.blocks[bk].toks[k:]
+        self.blocks[bi:bk+1]=[TokenBlock(toks[j:j+BLOCK]) for j in range(0,len(toks),BLOCK)]
+
+    def relex(self, i, start, new, edit_end, delta):
+        # lexes new from start, the start of token i, until a token equal
+        # to an old one the edit didn't touch (the edit ends at edit_end
+        # in old offsets) starts where that old one now starts. Returns
+        # the end k of the old tokens [i, k) to replace and the new tokens.
+        count=self.count()
+        old=self.iter_from(i)
+        cur=next(old,None)
+        ostart=self.lead if i==0 else start
+        k=i
+        triples=[]
+        stop=len(new)
+        for s,e,t in lex_tokens(new,start):
+            while cur is not None and (ostart<edit_end or ostart+delta<s):
+                ostart+=cur.width
+                cur=next(old,None)
+                k+=1
+            if cur is not None and ostart+delta==s and cur.token==t:
+                stop=s
+                break
+            triples.append((s,t))
+        else:
+            k=count
+        toks=[]
+        for j,(s,t) in enumerate(triples):
+            nxt=triples[j+1][0] if j+1<len(triples) else stop
+            toks.append(Tok(t,nxt-s))
+        if i==0:
+            self.lead=triples[0][0] if triples else stop
+        return k,toks
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> 'AST':
+        # replaces deleted characters at offset with inserted and returns
+        # the updated AST. While the text doesn't parse, program is None
+        # and error says why.
+        new=self.source[:offset]+inserted+self.source[offset+deleted:]
+        if not self.lexed:
+            self.source=new
+            self.rebuild()
+            return self.program
+        delta=len(inserted)-deleted
+        i,start=self.locate(offset)
+        if i>0:
+            # the edit may extend the token before, e.g. x|+ -> xy+
+            i-=1
+            start-=self.tok_at(i).width
+        if i==0:
+            start=0
+        count=self.count()
+        try:
+            k,toks=self.relex(i,start,new,offset+deleted,delta)
+        except TokenError:
+            self.source=new
+            self.rebuild()
+            return self.program
+        # the smallest span around the damaged tokens, found while they
+        # are still there
+        lo,hi=(i,k-1) if k>i else (i-1,i)
+        span=None
+        # new tokens before the first one only fit the whole fragment
+        if self.root is not None and lo>=0:
+            span=self.tok_at(lo).span
+        if not self.live(span):
+            # left over from an older tree, e.g. a token after the end of
+            # the expression
+            span=None
+        while span is not None:
+            if span.first is not None and self.index_of(span.first)<=lo and self.index_of(span.last)>=hi:
+                break
+            span=span.parent
+        self.source=new
+        self.splice(i,k,toks)
+        n=len(toks)
+        while span is not None:
+            # a dead first or last token was replaced, by the first or
+            # last new token respectively
+            a=i if span.first.block is None else self.index_of(span.first)
+            b=i+n-1 if span.last.block is None else self.index_of(span.last)
+            if self.reparse(span,a,b):
+                return self.program
+            span=span.parent
+        self.reparse(None,0,None)
+        return self.program
+
+    def live(self, span):
+        # whether span belongs to the current tree
+        while span is not None and span.parent is not None:
+            span=span.parent
+        return span is not None and span is self.root
+
+    def reparse(self, span, a, b):
+        # parses the tokens of span again, which are now [a, b]; span None
+        # parses the whole fragment. Fails if the new tokens don't form
+        # exactly one expression there.
+        cursor=TokenCursor(self.iter_from(a),a,[])
+        parent=None if span is None else span.parent
+        p=RecordingParser(cursor,parent)
+        try:
+            node=p.parse_expr()
+        except (TokenError, InvalidProgram, KeyError, AttributeError) as e:
+            if span is None:
+                self.root=None
+                self.error=e
+            return False
+        new=p.kids[0][0]
+        if span is not None and (node is None or cursor.i!=b+1):
+            return False
+        for t,owner in cursor.taken:
+            t.span=owner
+        if span is None:
+            self.root=new
+            self.error=None
+            return True
+        if span.slot is not None:
+            holder,name,j=span.slot
+            if j is None:
+                setattr(holder,name,node)
+            else:
+                getattr(holder,name)[j]=node
+        elif span.parent is not None:
+            return False
+        else:
+            self.root=new
+        new.slot=span.slot
+        anc=span.parent
+        while anc is not None and (anc.first is span.first or anc.last is span.last):
+            if anc.first is span.first:
+                anc.first=new.first
+            if anc.last is span.last:
+                anc.last=new.last
+            anc=anc.parent
+        return True
@@ -0,0 +1,165 @@
+# Embedding API: compile a fragment once, then run it many times with
+# different inputs.
+#
+#   rule = compile("if amount > limit then amount - limit else 0 end")
+#   rule.run({"amount": 120, "limit": 100})     # 20
+#
+# The variables a run binds go in the outermost scope, over the
+# prelude's bindings. Each run has its own Environment, which holds all
+# the state it changes, and the tree is only read, so one CompiledProgram
+# can be run from several threads at once. The prelude's lists, dicts
+# and sets are shared by the runs until one changes them in place: that
+# run changes a copy, made then.
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, TextIO, Union
+import threading
+
+from .nodes import *
+from .parser import parse
+from .typechecker import typecheck
+from .evaluator import eval, Environment
+from .values import PVector
+from .limits import Budget
+
+class Interpreter:
+    # the options and prelude shared by the programs it compiles, and a
+    # pool of environments for their runs
+    lazy: bool
+    prelude: Dict
+
+    def __init__(self, prelude: Union[str, Dict, None] = None, lazy: bool = False,
+                 modules: Optional['ModuleCache'] = None):
+        # modules: where use finds modules, by default the process-wide cache
+        self.lazy=lazy
+        self.modules=modules
+        # the types of the prelude's bindings, for compile
+        self.types={}
+        if isinstance(prelude, str):
+            # a fragment whose assignments become the prelude
+            environment=Environment(lazy, modules=modules)
+            eval(parse(prelude), environment)
+            try:
+                tenvironment=Environment(modules=modules)
+                typecheck(parse(prelude), tenvironment)
+                self.types=tenvironment.env[0]
+            except (TypeError, KeyError):
+                pass
+            prelude=environment.env[0]
+        else:
+            for k,v in (prelude or {}).items():
+                t=value_type(v)
+                if t is not None:
+                    self.types[k]=t
+        self.prelude=dict(prelude or {})
+        self.shared=containers(self.prelude.values())
+        self.pool: List[Environment]=[]
+        self.lock=threading.Lock()
+        # is_strict results for the programs' trees, shared by all runs
+        self.strict={}
+
+    def __getstate__(self):
+        # sent to worker processes without the pool, its lock and the
+        # module cache, which they have their own of
+        return {"lazy": self.lazy, "prelude": self.prelude, "types": self.types}
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.modules=None
+        self.shared=containers(self.prelude.values())
+        self.pool=[]
+        self.lock=threading.Lock()
+        self.strict={}
+
+    def compile(self, source: str, types: Optional[Dict] = None) -> 'CompiledProgram':
+        # with the types of the variables a run binds, the program is
+        # typechecked here once and runs typed; the prelude's bindings
+        # have the prelude's types unless types gives them others
+        program=parse(source)
+        if types is not None:
+            environment=Environment(modules=self.modules)
+            environment.env=[{**self.types, **types}]
+            program=typecheck(program, environment)
+        return CompiledProgram(self, source, program)
+
+    def acquire(self, bindings: Optional[Dict], out: Optional[TextIO] = None,
+                budget: Optional[Budget] = None) -> Environment:
+        with self.lock:
+            environment=self.pool.pop() if self.pool else None
+        if environment is None:
+            environment=Environment(self.lazy, strict=self.strict, modules=self.modules)
+            environment.shared=self.shared
+        environment.out=out
+        environment.budget=budget
+        # a new frame each time rather than clearing the old one: a
+        # generator or thunk from an earlier run may still hold it
+        frame=dict(self.prelude)
+        if bindings:
+            frame.update(bindings)
+        environment.env=[frame]
+        return environment
+
+    def release(self, environment: Environment):
+        environment.env=[]
+        environment.pending.clear()
+        environment.out=None
+        environment.budget=None
+        with self.lock:
+            self.pool.append(environment)
+
+def containers(values) -> frozenset:
+    # the ids of the lists, dicts, sets and persistent lists in values,
+    # at any depth
+    seen=set()
+    todo=list(values)
+    while todo:
+        v=todo.pop()
+        if isinstance(v, (list, set, PVector)) and id(v) not in seen:
+            seen.add(id(v))
+            todo.extend(v)
+        elif isinstance(v, dict) and id(v) not in seen:
+            seen.add(id(v))
+            todo.extend(v.values())
+    return frozenset(seen)
+
+def value_type(v: 'Value') -> Optional[SimType]:
+    # the type of a prelude value given as a dict, None when it has none
+    # typecheck can use; a container is typed by one of its elements
+    match v:
+        case bool():
+            return BoolType()
+        case int() | Fraction():
+            return NumType()
+        case float():
+            return FloatType()
+        case str():
+            return StringType()
+        case list() | PVector():
+            return ListType(value_type(v[0]) if len(v) else None)
+        case dict():
+            k=next(iter(v), None)
+            return DictType(value_type(k), value_type(v[k])) if v else DictType()
+        case set():
+            return SetType(value_type(next(iter(v))) if v else None)
+    return None
+
+@dataclass(frozen=True, eq=False)
+class CompiledProgram:
+    interpreter: Interpreter
+    source: str
+    program: AST
+
+    def run(self, bindings: Optional[Dict] = None, out: Optional[TextIO] = None,
+            budget: Optional[Budget] = None) -> 'Value':
+        # what the program prints goes to out, by default sys.stdout; with
+        # a budget the run stops with LimitExceeded past its limits, and
+        # budget.usage() tells what it used
+        environment=self.interpreter.acquire(bindings, out, budget)
+        try:
+            return eval(self.program, environment)
+        finally:
+            self.interpreter.release(environment)
+
+def compile(source: str, types: Optional[Dict] = None, prelude: Union[str, Dict, None] = None,
+            lazy: bool = False) -> CompiledProgram:
+    return Interpreter(prelude, lazy).compile(source, types)
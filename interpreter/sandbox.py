@@ -0,0 +1,184 @@
+# Sandboxed worker pool, for fragments that can't be trusted. Workers are
+# forked once, after the interpreter, the modules and the prelude are
+# loaded, and get jobs over a pipe. Each worker runs under an address
+# space limit, and each job under a CPU time limit, a wall-clock timeout
+# and optionally a Budget. A worker that dies or doesn't answer in time
+# is killed and replaced, and every worker is replaced after a number of
+# jobs so that whatever it accumulates is thrown away. Jobs can only use
+# the modules the pool was given.
+#
+#   with SandboxPool(4, cpu_seconds=2, memory=256 << 20) as pool:
+#       pool.run("1 + 2")      # {"value": "3", "output": "", "error": None, "usage": None}
+
+from collections import deque
+from typing import Dict, List, Optional
+import io
+import math
+import multiprocessing
+import os
+import queue
+import resource
+import signal
+import threading
+import time
+
+from .program import Interpreter
+from .limits import Budget, Limits
+
+# latencies kept for the metrics
+LATENCIES = 10000
+
+def worker_main(conn, interpreter: Interpreter, memory: Optional[int], limits: Optional[Limits]):
+    # runs jobs from conn until it gets None
+    resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+    if memory is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+    _,hard=resource.getrlimit(resource.RLIMIT_CPU)
+    while (job := conn.recv()) is not None:
+        source,bindings,cpu_seconds=job
+        if cpu_seconds is not None:
+            # RLIMIT_CPU counts the whole process, so the limit is moved
+            # on by the job's share; past it the kernel sends SIGXCPU,
+            # which kills the worker
+            r=resource.getrusage(resource.RUSAGE_SELF)
+            resource.setrlimit(resource.RLIMIT_CPU, (math.ceil(r.ru_utime+r.ru_stime+cpu_seconds), hard))
+        out=io.StringIO()
+        budget=Budget(limits) if limits is not None else None
+        try:
+            v=interpreter.compile(source).run(bindings, out, budget)
+            result={"value": str(v), "output": out.getvalue(), "error": None}
+        except MemoryError as e:
+            conn.send({"value": None, "output": out.getvalue(), "error": repr(e),
+                       "usage": budget and budget.usage(), "retire": True})
+            return
+        except Exception as e:
+            result={"value": None, "output": out.getvalue(), "error": repr(e)}
+        result["usage"]=budget and budget.usage()
+        conn.send(result)
+
+class Worker:
+    def __init__(self, context, pool: 'SandboxPool'):
+        self.conn,child=context.Pipe()
+        self.process=context.Process(target=worker_main, daemon=True,
+                                     args=(child, pool.interpreter, pool.memory, pool.limits))
+        self.process.start()
+        child.close()
+        self.jobs=0
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+    def retire(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.kill()
+        else:
+            self.conn.close()
+
+class SandboxPool:
+    def __init__(self, workers: int = None, max_jobs: int = 1000, cpu_seconds: Optional[float] = None,
+                 memory: Optional[int] = None, timeout: Optional[float] = None,
+                 limits: Optional[Limits] = None, prelude=None, modules: List[str] = (),
+                 module_dirs: List[str] = (), lazy: bool = False):
+        # workers: processes, by default one per CPU. max_jobs: jobs a
+        # worker runs before it is replaced. cpu_seconds: CPU time per
+        # job. memory: address space per worker, in bytes. timeout:
+        # wall-clock seconds per job. limits: a Budget for every job.
+        # prelude and modules are loaded here, before the workers fork.
+        # Jobs can use those modules and the files under module_dirs,
+        # nothing else.
+        from .modules import ModuleCache
+        cache=ModuleCache(allowed=list(modules)+list(module_dirs))
+        self.interpreter=Interpreter(prelude, lazy, cache)
+        for path in modules:
+            cache.load(path)
+        self.max_jobs=max_jobs
+        self.cpu_seconds=cpu_seconds
+        self.memory=memory
+        self.timeout=timeout
+        self.limits=limits
+        self.context=multiprocessing.get_context("fork")
+        self.idle=queue.Queue()
+        self.lock=threading.Lock()
+        self.counts={"jobs": 0, "errors": 0, "killed": 0, "recycled": 0}
+        self.latencies=deque(maxlen=LATENCIES)
+        self.start=time.monotonic()
+        self.workers=workers or os.cpu_count() or 1
+        for _ in range(self.workers):
+            self.idle.put(Worker(self.context, self))
+
+    def run(self, source: str, bindings: Optional[Dict] = None) -> Dict:
+        # runs one fragment on an idle worker, waiting for one if need
+        # be: {"value", "output", "error", "usage"}. Can be called from
+        # several threads at once.
+        worker=self.idle.get()
+        start=time.monotonic()
+        result=None
+        timed_out=False
+        try:
+            worker.conn.send((source, bindings, self.cpu_seconds))
+            if worker.conn.poll(self.timeout):
+                result=worker.conn.recv()
+            else:
+                timed_out=True
+        except (EOFError, OSError):
+            pass
+        worker.jobs+=1
+        replace=None
+        if timed_out:
+            worker.kill()
+            result={"value": None, "output": "", "error": "timeout after %gs" % self.timeout, "usage": None}
+            replace="killed"
+        elif result is None:
+            # it died: past its CPU time, or killed from outside
+            worker.process.join()
+            code=worker.process.exitcode
+            error="cpu limit" if code==-signal.SIGXCPU else "worker died (%s)" % code
+            worker.conn.close()
+            result={"value": None, "output": "", "error": error, "usage": None}
+            replace="killed"
+        elif result.pop("retire", False) or worker.jobs>=self.max_jobs:
+            worker.retire()
+            replace="recycled"
+        with self.lock:
+            self.counts["jobs"]+=1
+            self.counts["errors"]+=result["error"] is not None
+            if replace:
+                self.counts[replace]+=1
+            self.latencies.append(time.monotonic()-start)
+        self.idle.put(Worker(self.context, self) if replace else worker)
+        return result
+
+    def map(self, sources: List[str]) -> List[Dict]:
+        # runs sources on all the workers at once, results in order
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(self.workers) as threads:
+            return list(threads.map(self.run, sources))
+
+    def metrics(self) -> Dict:
+        # counts, jobs per second since the pool started, and latency
+        # percentiles in seconds over the last LATENCIES jobs
+        with self.lock:
+            m=dict(self.counts)
+            lat=sorted(self.latencies)
+        m["throughput"]=m["jobs"]/(time.monotonic()-self.start)
+        for p in (50, 90, 99):
+            m["p%d" % p]=lat[min(len(lat)-1, len(lat)*p//100)] if lat else None
+        return m
+
+    def close(self):
+        while self.workers:
+            self.idle.get().retire()
+            self.workers-=1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
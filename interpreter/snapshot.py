@@ -0,0 +1,133 @@
+# Snapshots: the whole state of an Environment written to a file, to be
+# restored in another process instead of being computed again.
+#
+#   snapshot(environment, "state.snap")
+#   environment = restore("state.snap")
+#
+# The file is a pickle of the scopes followed by the payloads of the big
+# lists of numbers, stored as raw machine words. restore maps the file
+# into memory and gives those lists back as ListViews over it, so they
+# are neither read nor copied until used; like any view, one is copied
+# into a list the first time it is changed.
+
+from array import array
+from types import MappingProxyType
+import copyreg
+import io
+import mmap
+import os
+import pickle
+import struct
+
+from .values import *
+from .evaluator import Environment
+
+MAGIC = b"TOYSNAP1"
+
+# lists at least this long go into the mapped payload
+MMAP_MIN = 1024
+
+class SnapshotError(Exception):
+    pass
+
+def packed(xs):
+    # xs as an array of machine words, or None when it holds anything
+    # but ints that fit in 64 bits or anything but floats
+    if all(type(x) is int for x in xs):
+        try:
+            return array("q", xs)
+        except OverflowError:
+            return None
+    if all(type(x) is float for x in xs):
+        return array("d", xs)
+    return None
+
+class SnapshotPickler(pickle.Pickler):
+    def __init__(self, file, payload):
+        super().__init__(file, pickle.HIGHEST_PROTOCOL)
+        # module frames are read-only proxies of a dict
+        self.dispatch_table=copyreg.dispatch_table.copy()
+        self.dispatch_table[MappingProxyType]=lambda p: (MappingProxyType, (dict(p),))
+        self.payload=payload
+        # id -> (list, persistent id), so a list referenced twice is
+        # stored once and the list can't be collected meanwhile
+        self.packed={}
+
+    def persistent_id(self, obj):
+        # lists, and views of a restored snapshot's payload
+        if type(obj) is ListView and isinstance(obj.base, memoryview):
+            xs=list(obj)
+        elif type(obj) is list and len(obj)>=MMAP_MIN:
+            xs=obj
+        else:
+            return None
+        entry=self.packed.get(id(obj))
+        if entry is None:
+            a=packed(xs)
+            if a is None:
+                return None
+            # payloads are aligned to their item size
+            self.payload.write(bytes(-self.payload.tell()%8))
+            pid=(a.typecode, self.payload.tell(), len(a))
+            self.payload.write(a.tobytes())
+            entry=self.packed[id(obj)]=(obj,pid)
+        return entry[1]
+
+def snapshot(environment: Environment, path: str):
+    # writes the scopes of environment, with everything they hold:
+    # numbers, strings, lists and the other containers, functions, and
+    # bindings lazy mode hasn't evaluated yet
+    state=io.BytesIO()
+    payload=io.BytesIO()
+    try:
+        SnapshotPickler(state, payload).dump((environment.lazy, environment.env))
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        # a generator half way through, for one, can't be saved
+        raise SnapshotError(repr(e))
+    state=state.getvalue()
+    # header, state, padding, payload
+    start=(16+len(state)+7)//8*8
+    # written beside it and renamed, so that environments restored from
+    # an old file at path keep their mapping of it
+    with open(path+".tmp", "wb") as f:
+        f.write(MAGIC+struct.pack("<Q", len(state)))
+        f.write(state)
+        f.write(bytes(start-16-len(state)))
+        f.write(payload.getbuffer())
+    os.replace(path+".tmp", path)
+
+class SnapshotUnpickler(pickle.Unpickler):
+    def __init__(self, file, payload):
+        super().__init__(file)
+        self.payload=payload
+        self.views={}
+
+    def persistent_load(self, pid):
+        typecode,offset,n=pid
+        if offset not in self.views:
+            data=self.payload[offset:offset+8*n].cast(typecode)
+            self.views[offset]=ListView(data, 0, n)
+        return self.views[offset]
+
+def restore(path: str) -> Environment:
+    # the Environment saved in path
+    with open(path, "rb") as f:
+        header=f.read(16)
+        if header[:8]!=MAGIC:
+            raise SnapshotError("not a snapshot: %s" % path)
+        size=struct.unpack("<Q", header[8:])[0]
+        start=(16+size+7)//8*8
+        if f.seek(0, 2)==start:
+            # nothing to map
+            f.seek(16)
+            payload=memoryview(b"")
+            state=f.read(size)
+        else:
+            # the views keep the mapping alive
+            mapped=mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            payload=memoryview(mapped)[start:]
+            state=mapped[16:16+size]
+    lazy,env=SnapshotUnpickler(io.BytesIO(state), payload).load()
+    environment=Environment(lazy)
+    environment.env=env
+    return environment
@@ -0,0 +1,51 @@
+# Debug tracing. A Tracer writes records from the lexer, the parser, the
+# typechecker, the evaluator and the scopes to a sink, keeping those at or
+# above a level in the categories it was asked for:
+#
+#   environment = Environment(trace=Tracer("debug", ["eval", "env"], sys.stderr))
+#
+# Without a tracer the places that could trace only test for it, behind
+# __debug__, so under python -O they are compiled out altogether. A
+# record's message is only formatted once it is known to be kept.
+
+from typing import Callable, Iterable, Optional, TextIO, Union
+import sys
+
+LEVELS = {"debug": 10, "info": 20, "warn": 30, "error": 40}
+
+CATEGORIES = ("lexer", "parser", "typecheck", "eval", "env")
+
+class Tracer:
+    def __init__(self, level: str = "debug", categories: Iterable[str] = CATEGORIES,
+                 sink: Union[TextIO, Callable[[str], None], None] = None):
+        # sink: a file written one line per record, or a function called
+        # with each record; None is sys.stderr at the time of writing
+        for c in categories:
+            if c not in CATEGORIES:
+                raise ValueError("no trace category %r" % c)
+        self.level=LEVELS[level]
+        self.categories=frozenset(categories)
+        self.sink=sink
+
+    def wants(self, category: str, level: str) -> bool:
+        return category in self.categories and LEVELS[level]>=self.level
+
+    def emit(self, category: str, level: str, message: str, *args):
+        # message % args, as "level category: text"
+        if not self.wants(category, level):
+            return
+        record="%s %s: %s" % (level, category, message % args if args else message)
+        sink=self.sink if self.sink is not None else sys.stderr
+        if callable(sink):
+            sink(record)
+        else:
+            sink.write(record+"\n")
+
+def trace_from_argv(argv: list) -> Optional[Tracer]:
+    # --trace eval,env [--trace-level info] [--trace-file trace.log]
+    if "--trace" not in argv:
+        return None
+    categories=argv[argv.index("--trace")+1].split(",")
+    level=argv[argv.index("--trace-level")+1] if "--trace-level" in argv else "debug"
+    sink=open(argv[argv.index("--trace-file")+1], "w") if "--trace-file" in argv else None
+    return Tracer(level, categories, sink)
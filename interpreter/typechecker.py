@@ -0,0 +1,408 @@
+# Typechecker: infers a type for every node of an AST.
+
+from typing import Dict, Optional
+import time
+
+from .nodes import *
+from . import evaluator, natives
+
+def typecheck(program: AST, environment: "evaluator.Environment" = None, in_place: bool = False) -> AST:
+    # Returns the typed tree. By default that is a new copy of the tree;
+    # with in_place the types are written onto the nodes of program
+    # itself, which keeps node identity and allocates almost nothing.
+    if environment is None:
+        environment = evaluator.Environment()
+    if in_place and not environment.in_place:
+        # only for this call: the caller's environment is left as it was
+        environment.in_place = True
+        try:
+            return typecheck(program, environment)
+        finally:
+            environment.in_place = False
+    def retype_(program, cls, *args):
+        return retype(environment, program, cls, *args)
+    def typecheck_(program):
+        return typecheck(program, environment)
+    match program:
+        case NumLiteral() as t: # already typed.
+            return t
+        case BoolLiteral() as t: # already typed.
+            return t
+        case StringLiteral() as t:
+            return t
+        case FloatLiteral() as t:
+            return t
+        case Variable(name):
+            t1=environment.get(name)
+            return retype_(program, Variable, name, t1)
+        case Put(Variable(name),e1):
+            v1=typecheck_(e1)
+            t1=join_type(environment.get(name),v1.type)
+            environment.update(name,t1)
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("typecheck", "debug", "put %s: %s", name, t1)
+            tname=retype_(program.var, Variable, name, t1)
+            v2=retype_(program, Put, tname, v1, t1)
+            return v2
+        case Get(Variable(name)):
+            t1=environment.get(name)
+            tname=retype_(program.var, Variable, name, t1)
+            v2=retype_(program, Get, tname, t1)
+            return v2
+        
+        case Assign(Variable(name),e1):
+            v1=typecheck_(e1)
+            tname=retype_(program.var, Variable, name, v1.type)
+            environment.add(name,tname.type)
+            return retype_(program, Assign, tname, v1, None)
+
+        case Seq(body):  
+            newBody=[]
+            for item in body:
+                v1=typecheck_(item)
+                newBody.append(v1)
+            return retype_(program, Seq, newBody, v1.type)
+        
+        case Print(e1):
+            v1=typecheck_(e1)
+            if __debug__ and environment.trace is not None:
+                environment.trace.emit("typecheck", "debug", "printing %s: %s", v1, v1.type)
+            return retype_(program, Print, v1, v1.type)
+
+        case UBoolOp(expr):
+            v1=typecheck_(expr)
+            return retype_(program, UBoolOp, v1, BoolType())
+
+        case BinOp("+", left, right):
+            tleft = typecheck_(left)
+            tright = typecheck_(right)
+            t = join_type(tleft.type, tright.type)
+            match t:
+                case StringType():
+                    # string-only node, eval skips the operand checks
+                    return retype_(program, Two_Str_concatenation, tleft, tright, StringType())
+                case ListType():
+                    return retype_(program, BinOp, "+", tleft, tright, t)
+            join_type(t, NumType())
+            return retype_(program, BinOp, "+", tleft, tright, number_type(tleft, tright))
+        case BinOp(op, left, right) if op in "*-/%&":
+            tleft = typecheck_(left)
+            tright = typecheck_(right)
+            join_type(tleft.type, NumType())
+            join_type(tright.type, NumType())
+            return retype_(program, BinOp, op, tleft, tright, number_type(tleft, tright))
+        case BinOp(op, left, right) if op in ("and", "or"):
+            tleft = typecheck_(left)
+            tright = typecheck_(right)
+            join_type(tleft.type, BoolType())
+            join_type(tright.type, BoolType())
+            return retype_(program, BinOp, op, tleft, tright, BoolType())
+        case BinOp("<" | ">" as op, left, right):
+            tleft = typecheck_(left)
+            tright = typecheck_(right)
+            if join_type(tleft.type, tright.type) not in (NumType(), StringType(), None):
+                raise TypeError()
+            return retype_(program, BinOp, op, tleft, tright, BoolType())
+        case BinOp("==", left, right):
+            tleft = typecheck_(left)
+            tright = typecheck_(right)
+            if tleft.type != NumType() or tright.type != NumType():
+                raise TypeError()
+            return retype_(program, BinOp, "==", tleft, tright, BoolType())
+        
+        case BinOp("=", left, right):
+            tleft = typecheck_(left)
+            tright = typecheck_(right)
+            join_type(tleft.type, tright.type)
+            return retype_(program, BinOp, "=", tleft, tright, BoolType())
+        case UnOp("not", expr):
+            texpr = typecheck_(expr)
+            join_type(texpr.type, BoolType())
+            return retype_(program, UnOp, "not", texpr, BoolType())
+        case if_else(c, t, f): # We have to typecheck both branches.
+            tc = typecheck_(c)
+            join_type(tc.type, BoolType())
+            tt = typecheck_(t)
+            tf = typecheck_(f)
+            # Both branches must have the same type, which becomes the type of the if-else.
+            return retype_(program, if_else, tc, tt, tf, join_type(tt.type, tf.type))
+
+        case while_loop(condition,e1):
+            environment.enter_scope()
+            condition1 = typecheck_(condition)
+            join_type(condition1.type, BoolType())
+            exp1= typecheck_(e1) 
+            environment.exit_scope()
+            return retype_(program, while_loop, condition1,exp1,exp1.type)
+        
+        case for_loop(Variable(name),e1,condition,updt,body):
+            v1=typecheck_(e1)
+            tname=retype_(program.var, Variable, name, v1.type)
+            environment.enter_scope()
+            environment.add(name,v1.type)
+            vcond=typecheck_(condition)
+            vbody=typecheck_(body)
+            vupdt=typecheck_(updt)   
+            environment.exit_scope()
+            return retype_(program, for_loop, tname, v1, vcond, vupdt, vbody, vbody.type)
+            
+        case foreach_loop(Variable(name),e1,body):
+            v1=typecheck_(e1)
+            et=elem_type(v1.type)
+            environment.enter_scope()
+            environment.add(name,et)
+            vbody=typecheck_(body)
+            environment.exit_scope()
+            tname=retype_(program.var, Variable, name, et)
+            return retype_(program, foreach_loop, tname, v1, vbody, vbody.type)
+
+        case Let(Variable(name),exp1,exp2) | LetMut(Variable(name),exp1,exp2):
+            v1=typecheck_(exp1)
+            tname=retype_(program.var, Variable, name, v1.type)
+            environment.enter_scope()
+            environment.add(name,tname.type)
+            v2=typecheck_(exp2)
+            environment.exit_scope()
+            # keep the node kind, a letMut stays a letMut
+            v3=retype_(program, type(program), tname, v1, v2, v2.type)
+            return v3
+        
+        case LetAnd(Variable(name1),expr1,Variable(name2),expr2,expr3):
+            newExp1=typecheck_(expr1)
+            newExp2=typecheck_(expr2)
+            tname1=retype_(program.var1, Variable, name1, newExp1.type)
+            tname2=retype_(program.var2, Variable, name2, newExp2.type)
+            environment.enter_scope()
+            if environment.check(name1):
+                environment.update(name1,newExp1.type)
+                
+            else:
+                environment.add(name1,newExp1.type)
+
+            if environment.check(name2):
+                environment.update(name2,newExp2.type)
+                
+            else:
+                environment.add(name2,newExp2.type)
+            
+            newExp3=typecheck_(expr3)
+            environment.exit_scope()
+            return retype_(program, LetAnd, tname1, newExp1, tname2, newExp2, newExp3, newExp3.type)
+        
+        case DictLiteral(keys,values):
+            tkeys=[typecheck_(k) for k in keys]
+            tvalues=[typecheck_(v) for v in values]
+            kt=None
+            vt=None
+            for k,v in zip(tkeys,tvalues):
+                kt=join_type(kt,k.type)
+                vt=join_type(vt,v.type)
+            return retype_(program, DictLiteral, tkeys,tvalues,DictType(kt,vt))
+
+        case SetLiteral(elements):
+            telements=[typecheck_(e) for e in elements]
+            et=None
+            for e in telements:
+                et=join_type(et,e.type)
+            return retype_(program, SetLiteral, telements,SetType(et))
+
+        case BuiltinCall(name,args):
+            b=natives.BUILTINS[name]
+            if b.signature is None:
+                raise TypeError()
+            targs=[typecheck_(arg) for arg in args]
+            t=b.signature([arg.type for arg in targs])
+            if b.rebinds:
+                environment.update(args[0].name,t)
+            return retype_(program, BuiltinCall, name,targs,t)
+
+        case ListLiteral(elements) | PVecLiteral(elements):
+            telements=[typecheck_(e) for e in elements]
+            et=None
+            for e in telements:
+                et=join_type(et,e.type)
+            return retype_(program, type(program), telements, ListType(et))
+
+        case Cons(Variable(name),word):
+            tword=typecheck_(word)
+            t=ListType(join_type(list_of([environment.get(name)]),tword.type))
+            environment.update(name,t)
+            return retype_(program, Cons, retype_(program.list1, Variable, name, t), tword, t)
+
+        case Index(Variable(name),idx):
+            tidx=typecheck_(idx)
+            t=environment.get(name)
+            match t:
+                case DictType(kt,vt):
+                    join_type(kt,tidx.type)
+                    return retype_(program, Index, retype_(program.v, Variable, name, t), tidx, vt)
+                case StringType():
+                    et=StringType()
+                case _:
+                    et=list_of([t])
+            join_type(tidx.type,NumType())
+            return retype_(program, Index, retype_(program.v, Variable, name, t), tidx, et)
+
+        case Str_slicing(e1,start,end):
+            te1=typecheck_(e1)
+            tstart=typecheck_(start)
+            tend=typecheck_(end)
+            join_type(tstart.type,NumType())
+            join_type(tend.type,NumType())
+            if not isinstance(te1.type,(StringType,ListType,type(None))):
+                raise TypeError()
+            return retype_(program, Str_slicing, te1,tstart,tend,te1.type)
+
+        case Two_Str_concatenation(e1,e2):
+            te1=typecheck_(e1)
+            te2=typecheck_(e2)
+            join_type(te1.type,StringType())
+            join_type(te2.type,StringType())
+            return retype_(program, Two_Str_concatenation, te1,te2,StringType())
+
+        case Yield(e1):
+            te1=typecheck_(e1)
+            return retype_(program, Yield, te1,te1.type)
+
+        case LetFun(Variable(name),params,body,expr):
+            environment.enter_scope()
+            fn=FnType(params,body,environment.fork())
+            environment.add(name,fn)
+            texpr=typecheck_(expr)
+            environment.exit_scope()
+            # a function only ever called with one list of argument types
+            # runs its typed, specialized body; otherwise the plain one
+            calls=[c for c in fn.calls.values() if c is not None]
+            if len(fn.calls)==1 and calls:
+                tbody=calls[0][0]
+            else:
+                tbody=body
+                if environment.in_place:
+                    # the annotations of the last call checked don't hold for the others
+                    clear_types(body)
+            tname=retype_(program.name, Variable, name, fn)
+            return retype_(program, LetFun, tname, params, tbody, texpr, texpr.type)
+
+        case Use(path,expr):
+            # the module's funcs, typed like those of a LetFun but
+            # never in place, since their bodies are shared
+            from .modules import MODULES
+            module=environment.modules or MODULES
+            environment.enter_scope()
+            for name,fn in module.load(path).items():
+                environment.add(name,FnType(fn.params,fn.body,environment.fork(),shared=True))
+            texpr=typecheck_(expr)
+            environment.exit_scope()
+            return retype_(program, Use, path, texpr, texpr.type)
+
+        case FunCall(Variable(name),args):
+            fn=environment.get(name)
+            if not isinstance(fn,FnType) or len(args)!=len(fn.params):
+                raise TypeError()
+            targs=[typecheck_(arg) for arg in args]
+            t=check_call(fn,[arg.type for arg in targs],environment)
+            return retype_(program, FunCall, retype_(program.fn, Variable, name, fn), targs, t)
+
+    raise TypeError()
+
+def retype(environment: "evaluator.Environment", program: AST, cls, *args) -> AST:
+    # the typed version of program, args being the fields of the new node
+    # with the type last. In in-place mode program keeps its kind and
+    # children and only gets the type.
+    if environment.in_place:
+        program.type=args[-1]
+        return program
+    return cls(*args)
+
+def clear_types(program: AST):
+    # forgets the types typecheck wrote onto a tree in place; literals
+    # keep theirs
+    if isinstance(program,(NumLiteral,BoolLiteral,StringLiteral,FloatLiteral)):
+        return
+    program.type=None
+    for c in children(program):
+        clear_types(c)
+
+def typecheck_report(source: str) -> Dict:
+    # time and peak memory of typechecking source by copying the tree
+    # and in place; each mode gets its own freshly parsed tree
+    import tracemalloc
+    from .parser import parse
+    report={}
+    for mode in ("copy","in_place"):
+        program=parse(source)
+        start=time.perf_counter()
+        typecheck(program, in_place=(mode=="in_place"))
+        seconds=time.perf_counter()-start
+        # timed separately, tracing allocations slows everything down
+        program=parse(source)
+        tracemalloc.start()
+        typecheck(program, in_place=(mode=="in_place"))
+        peak=tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        report[mode]=(seconds,peak)
+    return report
+
+def number_type(tleft: AST, tright: AST) -> Optional[SimType]:
+    # the result of arithmetic; only NumType when both operands are known
+    # to be numbers, which lets eval use the number-only BinOp path
+    if tleft.type==NumType() and tright.type==NumType():
+        return NumType()
+    return None
+
+def check_body(fn: FnType, types, environment: "evaluator.Environment") -> AST:
+    if fn.shared and environment.in_place:
+        environment=environment.fork()
+        environment.in_place=False
+    environment.enter_scope()
+    for par,t in zip(fn.params,types):
+        environment.add(par.name,t)
+    body=typecheck(fn.body, environment)
+    environment.exit_scope()
+    return body
+
+def check_call(fn: FnType, types, environment: "evaluator.Environment") -> Optional[SimType]:
+    # the result type of calling fn with arguments of the given types
+    key=tuple(types)
+    if key in fn.calls:
+        if fn.calls[key] is None:
+            # recursive call, the result isn't known yet
+            fn.recursive.add(key)
+            return None
+        return fn.calls[key][1]
+    fn.calls[key]=None
+    body=check_body(fn, types, environment)
+    fn.calls[key]=(body,result_type(fn, body))
+    if key in fn.recursive:
+        # check again so the recursive calls get the result type too
+        body=check_body(fn, types, environment)
+        fn.calls[key]=(body,join_type(fn.calls[key][1],result_type(fn, body)))
+    return fn.calls[key][1]
+
+def result_type(fn: FnType, body: AST) -> Optional[SimType]:
+    # a generator function returns a stream of everything it yields
+    if not evaluator.contains_yield(fn.body):
+        return body.type
+    t=None
+    def visit(node):
+        nonlocal t
+        match node:
+            case Yield(_, yt):
+                t=join_type(t,yt)
+            case LetFun():
+                return
+        for c in children(node):
+            visit(c)
+    visit(body)
+    return ListType(t)
+
+# def test_typecheck():
+#     # import pytest
+#     te = typecheck(BinOp("+", NumLiteral(2), NumLiteral(3)))
+#     print("te: ",te)
+#     assert te.type == NumType()
+#     te = typecheck(BinOp("<", NumLiteral(2), NumLiteral(3)))
+#     print("te: ",te)
+#     assert te.type == BoolType()
+#     with pytest.raises(TypeError):
+#         typecheck(BinOp("+", BinOp("*", NumLiteral(2), NumLiteral(3)), BinOp("<", NumLiteral(2), NumLiteral(3))))
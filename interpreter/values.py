@@ -0,0 +1,389 @@
+# Runtime values beyond the plain Python ones: persistent vectors,
+# ropes and slice views.
+
+from fractions import Fraction
+from itertools import islice
+
+class PVector:
+    # Persistent vector: a 32-way trie of Python lists plus a tail
+    # buffer, as in Clojure. Nodes are never modified once built, so
+    # appended/popped/assoc copy only the path to the changed leaf and
+    # share everything else with the old version.
+    __slots__ = ("count", "shift", "root", "tail")
+
+    def __init__(self, count=0, shift=5, root=None, tail=None):
+        self.count = count
+        self.shift = shift
+        self.root = root if root is not None else []
+        self.tail = tail if tail is not None else []
+
+    def from_iter(items):
+        # builds the trie bottom up instead of appending one at a time
+        items = list(items)
+        n = len(items)
+        tail_off = 0 if n < 32 else ((n - 1) >> 5) << 5
+        level = [items[i:i+32] for i in range(0, tail_off, 32)]
+        shift = 5
+        while len(level) > 32:
+            level = [level[i:i+32] for i in range(0, len(level), 32)]
+            shift += 5
+        return PVector(n, shift, level, items[tail_off:])
+
+    def tail_offset(self):
+        if self.count < 32:
+            return 0
+        return ((self.count - 1) >> 5) << 5
+
+    def leaf_for(self, i):
+        if i >= self.tail_offset():
+            return self.tail
+        node = self.root
+        for level in range(self.shift, 0, -5):
+            node = node[(i >> level) & 31]
+        return node
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return self.leaf_for(i)[i & 31]
+
+    def __iter__(self):
+        for i in range(0, self.count, 32):
+            yield from self.leaf_for(i)
+
+    def __eq__(self, other):
+        if isinstance(other, (PVector, list)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return "plst " + repr(list(self))
+
+    def __add__(self, other):
+        # a new vector; concatenation keeps the persistent representation
+        return PVector.from_iter(list(self) + list(other))
+
+    def __radd__(self, other):
+        return PVector.from_iter(list(other) + list(self))
+
+    def appended(self, x):
+        if self.count - self.tail_offset() < 32:
+            return PVector(self.count + 1, self.shift, self.root, self.tail + [x])
+        shift = self.shift
+        if (self.count >> 5) > (1 << shift):
+            # root is full, grow the tree by one level
+            root = [self.root, self.new_path(shift, self.tail)]
+            shift += 5
+        else:
+            root = self.push_tail(shift, self.root, self.tail)
+        return PVector(self.count + 1, shift, root, [x])
+
+    def new_path(self, level, node):
+        if level == 0:
+            return node
+        return [self.new_path(level - 5, node)]
+
+    def push_tail(self, level, parent, tailnode):
+        subidx = ((self.count - 1) >> level) & 31
+        ret = list(parent)
+        if level == 5:
+            node = tailnode
+        elif subidx < len(parent):
+            node = self.push_tail(level - 5, parent[subidx], tailnode)
+        else:
+            node = self.new_path(level - 5, tailnode)
+        if subidx == len(ret):
+            ret.append(node)
+        else:
+            ret[subidx] = node
+        return ret
+
+    def popped(self):
+        if self.count == 0:
+            raise IndexError("pop from empty list")
+        if self.count == 1:
+            return PVector()
+        if self.count - self.tail_offset() > 1:
+            return PVector(self.count - 1, self.shift, self.root, self.tail[:-1])
+        tail = self.leaf_for(self.count - 2)
+        root = self.pop_tail(self.shift, self.root)
+        shift = self.shift
+        if root is None:
+            root = []
+        if shift > 5 and len(root) == 1:
+            root = root[0]
+            shift -= 5
+        return PVector(self.count - 1, shift, root, tail)
+
+    def pop_tail(self, level, node):
+        subidx = ((self.count - 2) >> level) & 31
+        if level > 5:
+            child = self.pop_tail(level - 5, node[subidx])
+            if child is None and subidx == 0:
+                return None
+            ret = node[:subidx]
+            if child is not None:
+                ret.append(child)
+            return ret
+        if subidx == 0:
+            return None
+        return node[:subidx]
+
+    def assoc(self, i, x):
+        if i < 0:
+            i += self.count
+        if i == self.count:
+            return self.appended(x)
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        if i >= self.tail_offset():
+            tail = list(self.tail)
+            tail[i & 31] = x
+            return PVector(self.count, self.shift, self.root, tail)
+        return PVector(self.count, self.shift, self.do_assoc(self.shift, self.root, i, x), self.tail)
+
+    def do_assoc(self, level, node, i, x):
+        ret = list(node)
+        if level == 0:
+            ret[i & 31] = x
+        else:
+            sub = (i >> level) & 31
+            ret[sub] = self.do_assoc(level - 5, node[sub], i, x)
+        return ret
+
+class Rope:
+    # String built by concatenation. Joining two strings only allocates
+    # a node; the characters are copied once, when the rope is flattened
+    # for printing, indexing or comparison. Short pieces are still joined
+    # eagerly so that a loop appending characters builds leaves of up to
+    # LEAF characters rather than one node per character.
+    __slots__ = ("left", "right", "length", "flat")
+    LEAF = 256
+
+    def __init__(self, left, right):
+        self.left = left
+        self.right = right
+        self.length = len(left) + len(right)
+        self.flat = None
+
+    def concat(a, b):
+        if isinstance(a, StrView):
+            a = str(a)
+        if isinstance(b, StrView):
+            b = str(b)
+        if isinstance(a, Rope) and a.flat is not None:
+            a = a.flat
+        if isinstance(b, Rope) and b.flat is not None:
+            b = b.flat
+        if not len(b):
+            return a
+        if not len(a):
+            return b
+        if isinstance(a, str) and isinstance(b, str) and len(a) + len(b) <= Rope.LEAF:
+            return a + b
+        if isinstance(a, Rope) and isinstance(a.right, str) and isinstance(b, str) \
+                and len(a.right) + len(b) <= Rope.LEAF:
+            return Rope(a.left, a.right + b)
+        return Rope(a, b)
+
+    def __len__(self):
+        return self.length
+
+    def __str__(self):
+        if self.flat is None:
+            parts = []
+            stack = [self]
+            while stack:
+                node = stack.pop()
+                if isinstance(node, str):
+                    parts.append(node)
+                elif node.flat is not None:
+                    parts.append(node.flat)
+                else:
+                    stack.append(node.right)
+                    stack.append(node.left)
+            # the children are kept: a rope in a prelude is shared by
+            # threads, which may be walking them while this one flattens
+            self.flat = "".join(parts)
+        return self.flat
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __eq__(self, other):
+        if isinstance(other, (str, Rope)):
+            return len(self) == len(other) and str(self) == str(other)
+        return NotImplemented
+
+    def __lt__(self, other):
+        return str(self) < as_str(other)
+
+    def __gt__(self, other):
+        return str(self) > as_str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+    def __getitem__(self, i):
+        return str(self)[i]
+
+    def __iter__(self):
+        return iter(str(self))
+
+    def __contains__(self, sub):
+        return as_str(sub) in str(self)
+
+    def __add__(self, other):
+        return Rope.concat(self, other)
+
+    def __radd__(self, other):
+        return Rope.concat(other, self)
+
+    def __mul__(self, n):
+        return str(self) * n
+
+    __rmul__ = __mul__
+
+class StrView:
+    # Zero-copy slice of a string: the parent string plus offsets.
+    # Lookups, length, counting and comparison work on the parent
+    # directly; a new string is only built by str().
+    __slots__ = ("base", "start", "stop")
+
+    def __init__(self, base, start, stop):
+        self.base = base
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __str__(self):
+        return self.base[self.start:self.stop]
+
+    def __repr__(self):
+        return repr(str(self))
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            r = range(self.start, self.stop)[i]
+            stop = r.stop if r.stop >= 0 else None
+            return self.base[r.start:stop:r.step]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.base[self.start + i]
+
+    def __iter__(self):
+        return islice(self.base, self.start, self.stop)
+
+    def __contains__(self, sub):
+        return self.base.find(as_str(sub), self.start, self.stop) != -1
+
+    def count(self, sub):
+        return self.base.count(sub, self.start, self.stop)
+
+    def __mul__(self, n):
+        return str(self) * n
+
+    __rmul__ = __mul__
+
+    def __eq__(self, other):
+        if isinstance(other, (str, Rope, StrView)):
+            return len(self) == len(other) and self.base.startswith(as_str(other), self.start, self.stop)
+        return NotImplemented
+
+    def __lt__(self, other):
+        return str(self) < as_str(other)
+
+    def __gt__(self, other):
+        return str(self) > as_str(other)
+
+    def __hash__(self):
+        return hash(str(self))
+
+class ListView:
+    # Zero-copy slice of a persistent list or of a snapshot's mapped
+    # payload, neither of which is ever changed in place; mutating the
+    # view itself first copies it into a new list.
+    __slots__ = ("base", "start", "stop")
+
+    def __init__(self, base, start, stop):
+        self.base = base
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.base[j] for j in range(self.start, self.stop)[i]]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.base[self.start + i]
+
+    def __iter__(self):
+        return map(self.base.__getitem__, range(self.start, self.stop))
+
+    def __eq__(self, other):
+        if isinstance(other, (list, PVector, ListView)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+# Slices shorter than this are copied, a view would cost more than it saves.
+VIEW_MIN = 32
+
+def make_view(v, start, stop):
+    # slices strings, lists and views of them without copying the data.
+    # Plain lists can be changed in place, so their slices are copies.
+    if isinstance(v, Rope):
+        v = str(v)
+    if isinstance(v, range):
+        return v[start:stop]
+    start, stop, _ = slice(start, stop).indices(len(v))
+    stop = max(start, stop)
+    if isinstance(v, (StrView, ListView)):
+        base = v.base
+        start, stop = v.start + start, v.start + stop
+    else:
+        base = v
+    if stop - start < VIEW_MIN or isinstance(base, list):
+        if isinstance(base, (str, list)):
+            return base[start:stop]
+        return [base[i] for i in range(start, stop)]
+    if isinstance(base, str):
+        return StrView(base, start, stop)
+    return ListView(base, start, stop)
+
+def as_str(v):
+    # flattens rope strings and string views, any other value is
+    # returned unchanged
+    if isinstance(v, (Rope, StrView)):
+        return str(v)
+    return v
+
+Value = Fraction | bool | str | list | dict | set | PVector | Rope | StrView | ListView